@@ -0,0 +1,40 @@
+"""index the ai_journal_analysis quartile expression
+
+Revision ID: a3b4c5d6e7f8
+Revises: f2a3b4c5d6e7
+Create Date: 2026-01-06 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3b4c5d6e7f8'
+down_revision = 'f2a3b4c5d6e7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ->> accessors are not covered by any GIN opclass, so the quartile
+    # filter/sort used by the UI gets its own BTREE expression index
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_publications_ai_journal_quartile'),
+            'publications',
+            [sa.text("(ai_journal_analysis->>'quartile_estimate')")],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f('ix_publications_ai_journal_quartile'),
+            table_name='publications',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
@@ -0,0 +1,51 @@
+"""add doi_is_suspicious generated column
+
+Revision ID: a7b8c9d0e1f2
+Revises: e5f6a7b8c9d0
+Create Date: 2026-01-06 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7b8c9d0e1f2'
+down_revision = 'e5f6a7b8c9d0'
+branch_labels = None
+depends_on = None
+
+# Same predicate as core.models.SUSPICIOUS_DOI_SQL at the time of this revision
+SUSPICIOUS_DOI_SQL = (
+    "canonical_doi IS NOT NULL AND ("
+    "lower(canonical_doi) LIKE '%xxxxx%' OR lower(canonical_doi) LIKE '%doi%' "
+    "OR lower(canonical_doi) LIKE '%10.000%' OR lower(canonical_doi) LIKE '%insert%' "
+    "OR lower(canonical_doi) LIKE '%placeholder%' "
+    "OR lower(trim(canonical_doi)) LIKE '%/j' "
+    "OR length(trim(canonical_doi)) < 14)"
+)
+
+
+def upgrade():
+    # Stored generated column: PostgreSQL fills it for existing rows and keeps it
+    # current on every INSERT/UPDATE, including bulk updates that bypass the ORM.
+    op.add_column('publications', sa.Column(
+        'doi_is_suspicious',
+        sa.Boolean(),
+        sa.Computed(SUSPICIOUS_DOI_SQL, persisted=True),
+        nullable=True
+    ))
+
+    # external.repair_bad_dois only scans suspicious rows with a local PDF; the partial
+    # index keeps that candidate set small without indexing every row.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_publications_doi_is_suspicious "
+            "ON publications (id) WHERE doi_is_suspicious AND local_path IS NOT NULL"
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_publications_doi_is_suspicious")
+    op.drop_column('publications', 'doi_is_suspicious')
@@ -0,0 +1,35 @@
+"""index researcher_publications foreign keys
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-01-06 12:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8c9d0e1f2a3'
+down_revision = 'a7b8c9d0e1f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Researcher <-> publication links are fetched with IN (...) on either side
+    # (public researchers/publications, graph); PostgreSQL doesn't index FKs by itself.
+    # Author lookups for a set of publications only read (publication_id, member_id), so the
+    # publication side gets a composite index that serves them with an index-only scan.
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_researcher_publications_member_id ON researcher_publications (member_id)")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_researcher_publications_publication_member "
+            "ON researcher_publications (publication_id, member_id)"
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_researcher_publications_publication_member")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_researcher_publications_member_id")
@@ -0,0 +1,31 @@
+"""add content_sha256 to publications
+
+Revision ID: d0e1f2a3b4c5
+Revises: b8c9d0e1f2a3
+Create Date: 2026-01-06 13:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd0e1f2a3b4c5'
+down_revision = 'b8c9d0e1f2a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # SHA-256 of the uploaded PDF; upload_pdf looks it up to reject re-uploads
+    # before parsing. Existing rows stay NULL (NULLs don't collide in a unique index).
+    op.add_column('publications', sa.Column('content_sha256', sa.String(length=64), nullable=True))
+
+    with op.get_context().autocommit_block():
+        op.execute("CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ix_publications_content_sha256 ON publications (content_sha256)")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_publications_content_sha256")
+    op.drop_column('publications', 'content_sha256')
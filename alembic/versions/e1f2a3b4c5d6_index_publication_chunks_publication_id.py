@@ -0,0 +1,33 @@
+"""index publication_chunks.publication_id
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-01-06 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1f2a3b4c5d6'
+down_revision = 'd0e1f2a3b4c5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Deleting a publication, checking whether it is already indexed for RAG and the
+    # indexed-publications stats all filter chunks by publication_id, which had no index.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_publication_chunks_publication_id "
+            "ON publication_chunks (publication_id)"
+        )
+    # Fresh statistics so the planner picks the new index right away
+    op.execute("ANALYZE publication_chunks")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_publication_chunks_publication_id")
@@ -0,0 +1,28 @@
+"""add publications url prefix index
+
+Revision ID: e5f6a7b8c9d0
+Revises: 144889d1cb1c
+Create Date: 2026-01-06 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5f6a7b8c9d0'
+down_revision = '144889d1cb1c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # text_pattern_ops lets LIKE '10.%' (external.list_existing_dois) use the index
+    # regardless of the database collation.
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_publications_url_pattern ON publications (url text_pattern_ops)")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_publications_url_pattern")
@@ -0,0 +1,45 @@
+"""convert author_metadata and ai_journal_analysis to JSONB with GIN indexes
+
+Revision ID: f2a3b4c5d6e7
+Revises: e1f2a3b4c5d6
+Create Date: 2026-01-06 14:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a3b4c5d6e7'
+down_revision = 'e1f2a3b4c5d6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # JSONB is stored pre-parsed and supports indexed containment queries.
+    # The type change rewrites publications once, under an exclusive lock.
+    op.execute("ALTER TABLE publications ALTER COLUMN author_metadata TYPE jsonb USING author_metadata::jsonb")
+    op.execute("ALTER TABLE publications ALTER COLUMN ai_journal_analysis TYPE jsonb USING ai_journal_analysis::jsonb")
+
+    # GIN indexes for `@>` lookups (e.g. author_metadata @> '{"orcid": "..."}').
+    # jsonb_path_ops only supports @> but is much smaller than jsonb_ops.
+    # CONCURRENTLY cannot run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_publications_author_metadata_gin "
+            "ON publications USING GIN (author_metadata jsonb_path_ops)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_publications_ai_journal_analysis_gin "
+            "ON publications USING GIN (ai_journal_analysis jsonb_path_ops)"
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_publications_ai_journal_analysis_gin")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_publications_author_metadata_gin")
+
+    op.execute("ALTER TABLE publications ALTER COLUMN ai_journal_analysis TYPE json USING ai_journal_analysis::json")
+    op.execute("ALTER TABLE publications ALTER COLUMN author_metadata TYPE json USING author_metadata::json")
@@ -1,25 +1,12 @@
 # Backend API Routes Package
-
-from . import (
-    auth,
-    compliance,
-    publications,
-    researchers,
-    rag,
-    dashboard,
-    members,
-    files,
-    reports,
-    public,
-    catalogs,
-    external,
-    students
-)
+# Submodules are imported by main.py when their routers are registered,
+# so importing this package does not pull in every route module.
 
 __all__ = [
     'auth',
     'compliance',
     'publications',
+    'enrichment',
     'researchers',
     'rag',
     'dashboard',
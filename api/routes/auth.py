@@ -13,7 +13,7 @@ from typing import Optional
 from database.session import get_db
 from services.auth_service import AuthService
 from core.models import User, UserRole
-from core.security import get_current_user, oauth2_scheme
+from core.security import get_current_user, oauth2_scheme, revoke_token
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -61,4 +61,10 @@ async def login(
 @router.get("/me", response_model=UserResponse)
 async def read_users_me(current_user: User = Depends(get_current_user)):
     """Get current user information"""
-    return current_user
+    return UserResponse.model_validate(current_user)
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(token: str = Depends(oauth2_scheme)):
+    """Revoke the current token; it is rejected from now until it expires"""
+    revoke_token(token)
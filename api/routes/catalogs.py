@@ -1,7 +1,10 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from typing import List, Dict, Any
-import sqlite3
-from config import DB_PATH
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from cachetools import TTLCache
+
+from database.session import get_db
 
 router = APIRouter(prefix="/catalogs", tags=["Catalogs"])
 
@@ -14,34 +17,42 @@ WP_COLORS = {
     5: "#FF33F3", # Pink-ish
     # Add more if needed or use a generator
 }
+DEFAULT_WP_COLOR = "#808080"
+
+# Same colors indexed by WP id, filled with the default for unknown ids
+WP_COLOR_BY_ID = [DEFAULT_WP_COLOR] * (max(WP_COLORS) + 1)
+for _wp_id, _color in WP_COLORS.items():
+    WP_COLOR_BY_ID[_wp_id] = _color
+
+# WPs change rarely; keep the built list for a few minutes instead of hitting the DB on every page load
+_wps_cache = TTLCache(maxsize=1, ttl=300)
 
 @router.get("/working-packages")
-async def get_working_packages():
+async def get_working_packages(db: Session = Depends(get_db)):
     """
     Get list of Working Packages with display colors.
     """
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
+    cached = _wps_cache.get("wps")
+    if cached is not None:
+        # Copies, so a caller mutating the response can't alter the cached entries
+        return [dict(wp) for wp in cached]
+
     try:
-        cursor.execute("SELECT id, nombre FROM wps ORDER BY id ASC")
-        rows = cursor.fetchall()
+        # Reuse the pooled engine connection instead of opening a new sqlite3 connection per request
+        rows = db.execute(text("SELECT id, nombre FROM wps ORDER BY id ASC")).all()
         
         results = []
-        for row in rows:
-            wp_id = row["id"]
+        for wp_id, nombre in rows:
             # Default color if not in map
-            color = WP_COLORS.get(wp_id, "#808080") 
+            color = WP_COLOR_BY_ID[wp_id] if 0 <= wp_id < len(WP_COLOR_BY_ID) else DEFAULT_WP_COLOR
             
             results.append({
                 "id": wp_id,
-                "name": row["nombre"],
+                "name": nombre,
                 "color": color
             })
             
-        return results
+        _wps_cache["wps"] = results
+        return [dict(wp) for wp in results]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching WPs: {str(e)}")
-    finally:
-        conn.close()
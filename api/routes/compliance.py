@@ -3,35 +3,53 @@ Compliance Audit Routes for CECAN Platform
 API endpoints for "El Robot" compliance auditing system
 """
 
-from fastapi import APIRouter, Depends
+import logging
+
+from fastapi import APIRouter, Depends, BackgroundTasks
 from sqlalchemy.orm import Session
 
-from database.session import get_db
+from database.session import get_db, get_session
 from core.security import require_editor, require_viewer
 from core.models import User
 from services import compliance_service
 
 router = APIRouter(prefix="/compliance", tags=["Compliance Audit"])
+logger = logging.getLogger(__name__)
+
+
+def _run_full_audit_task():
+    """Background half of run_full_audit: audit with its own session (the request's is closed by then)."""
+    db = get_session()
+    try:
+        summary = compliance_service.run_full_audit(db)
+        logger.info("Compliance audit finished: %s", summary)
+    except Exception:
+        logger.exception("Compliance audit failed")
+    finally:
+        db.close()
 
 
 @router.post("/audit")
 async def run_full_audit(
-    db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(require_editor)
 ):
     """
     Run complete compliance audit on all publications.
     Requires Editor role or higher.
     """
-    result = compliance_service.run_full_audit(db)
+    # Run audit in background; large catalogs would otherwise hold the request open
+    background_tasks.add_task(_run_full_audit_task)
+    
     return {
-        "message": f"Auditoría completada: {result['summary']['total_audited']} publicaciones procesadas",
-        "summary": result["summary"]
+        "message": "Auditoría iniciada en segundo plano",
+        "status": "processing"
     }
 
 
+# Report and single audits query the DB synchronously: plain `def` so they run in the threadpool
 @router.get("/report")
-async def get_compliance_report(
+def get_compliance_report(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_viewer)
 ):
@@ -44,7 +62,7 @@ async def get_compliance_report(
 
 
 @router.post("/audit/{publication_id}")
-async def audit_single_publication(
+def audit_single_publication(
     publication_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_editor)
@@ -3,7 +3,14 @@ General/Dashboard Routes for CECAN Platform
 API endpoints for metrics, graph data, and dashboard statistics
 """
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+import hashlib
+import threading
+
+import orjson
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
 from core.security import get_current_user
@@ -15,36 +22,68 @@ from services.ingestion_service import ingestion_service
 
 router = APIRouter(tags=["Dashboard"])
 
+# Polling clients get the same payload for a short window; keyed by path -> (payload, etag)
+_dashboard_cache = TTLCache(maxsize=16, ttl=30)
+_dashboard_cache_lock = threading.Lock()  # handlers run in the threadpool
+
+
+def _cached_response(request: Request, build):
+    """Serve a dashboard payload from cache with an ETag, answering 304 when the client already has it."""
+    key = request.url.path
+    with _dashboard_cache_lock:
+        entry = _dashboard_cache.get(key)
+    if entry is None:
+        payload = jsonable_encoder(build())
+        body = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        entry = (payload, '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest())
+        with _dashboard_cache_lock:
+            _dashboard_cache[key] = entry
+
+    payload, etag = entry
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return ORJSONResponse(content=payload, headers={"ETag": etag})
+
+
+def _run_sync_and_invalidate(db: Session):
+    ingestion_service.run_weekly_sync(db)
+    with _dashboard_cache_lock:
+        _dashboard_cache.clear()
+
 
+# Payloads are built with synchronous DB queries on a cache miss: plain `def` runs them in the threadpool
 @router.get("/metrics")
-async def get_metrics(
+def get_metrics(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Returns aggregated metrics for the Indicators dashboard"""
-    return analytics_service.get_aggregated_metrics(db)
+    return _cached_response(request, lambda: analytics_service.get_aggregated_metrics(db))
 
 
 @router.get("/graph-data")
-async def get_graph_data(
+def get_graph_data(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Returns the graph data (nodes and edges) for network visualization"""
     try:
-        return build_graph_data(db)
+        return _cached_response(request, lambda: build_graph_data(db))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching graph data: {str(e)}")
 
 
 @router.get("/impact-flow")
-async def get_impact_flow(
+def get_impact_flow(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Returns Sankey diagram data for Impact Flow visualization (WP -> Nodes)"""
     try:
-        return analytics_service.get_impact_flow_graph(db)
+        return _cached_response(request, lambda: analytics_service.get_impact_flow_graph(db))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching impact flow data: {str(e)}")
 
@@ -58,8 +97,8 @@ async def sync_external_data(
     """
     Triggers an asynchronous synchronization with external APIs (OpenAlex, Semantic Scholar).
     """
-    # Run sync in background to avoid HTTP timeout
-    background_tasks.add_task(ingestion_service.run_weekly_sync, db)
+    # Run sync in background to avoid HTTP timeout; cached dashboard payloads are dropped once it finishes
+    background_tasks.add_task(_run_sync_and_invalidate, db)
     
     return {
         "message": "Sincronización externa iniciada en segundo plano", 
@@ -2,20 +2,122 @@
 External Metrics Routes - Atomic endpoints for testing external API integrations
 """
 
-from fastapi import APIRouter, HTTPException, Query, Depends, Body
+from fastapi import APIRouter, HTTPException, Query, Depends, Body, Request
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
 from typing import Dict, Any, List
+import asyncio
+import concurrent.futures
 import os
+import re
+import threading
+import weakref
 from datetime import datetime
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from cachetools import TTLCache
+
 from services.scraper_service import get_openalex_metrics, get_semantic_scholar_metrics
 from services.openalex_service import extract_publication_metadata
 from database.session import get_db
 from core.models import Publication, WosJournalMirror
+from core.rate_limit import limiter
 
 router = APIRouter(tags=["External Metrics"])
 
+# DOI patterns, compiled once. Suffixes use a bounded character class and
+# length so malformed PDF text can't trigger runaway backtracking.
+_DOI_PATTERN = re.compile(r'10\.\d{4,9}/[A-Za-z0-9._;()/:+-]{3,200}')
+# Robust variant allows newlines/hyphens inside the suffix (broken PDF lines)
+_DOI_PATTERN_ROBUST = re.compile(r'(10\.\d{4,9}/[-._;()/:a-zA-Z0-9\s]{3,300})')
+_WHITESPACE = re.compile(r'\s+')
+# Syntactic sanity check for stored DOIs, run before any network lookup
+_DOI_SYNTAX = re.compile(r'^10\.\d{4,9}/[^\s]{3,}$')
+
+# Shared keep-alive pool for OpenAlex lookups (audit/repair fire many requests in a row)
+_openalex_session = requests.Session()
+_openalex_session.mount("https://", HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=50,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+))
+_openalex_session.headers.update({"User-Agent": "cecan-backend/1.0 (mailto:admin@cecan.cl)"})
+
+# Definitive OpenAlex answers per DOI (found / not found), so re-audits and repairs skip the network
+_openalex_cache = TTLCache(maxsize=4096, ttl=3600)
+_openalex_cache_lock = threading.Lock()
+
+
+def _openalex_lookup(clean_doi: str):
+    """Check a DOI against OpenAlex. Returns (is_valid, status, metadata)."""
+    key = clean_doi.lower()
+    with _openalex_cache_lock:
+        cached = _openalex_cache.get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        url = f"https://api.openalex.org/works/https://doi.org/{clean_doi}"
+        # Polite pool
+        response = _openalex_session.get(url, params={"mailto": "admin@cecan.cl"}, timeout=5)
+        if response.status_code == 200:
+            data = response.json()
+            metadata = extract_publication_metadata(data)
+            result = (True, "valid_openalex", metadata)
+        elif response.status_code == 404:
+            result = (False, "not_found_openalex", None)
+        else:
+            return False, f"error_openalex_{response.status_code}", None
+    except Exception:
+        return False, "error_openalex_connection", None
+
+    with _openalex_cache_lock:
+        _openalex_cache[key] = result
+    return result
+
+# Caps in-flight outbound DOI checks across concurrent requests, independent of the rate limits.
+# asyncio primitives bind to one event loop, so keep one semaphore per running loop.
+_outbound_semaphores = weakref.WeakKeyDictionary()
+
+
+def _outbound_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _outbound_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _outbound_semaphores[loop] = asyncio.Semaphore(20)
+    return semaphore
+
+# PDF parsing is CPU/IO blocking; keep it off the event loop (one reader per file, so threads are safe)
+pdf_executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+# Separate pool for page-level extraction inside a single file (sharing pdf_executor could deadlock)
+pdf_page_executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+
+
+def _extract_pdf_text(path: str, max_pages: int, stop_pattern=None) -> str:
+    """
+    Reads the text of the first max_pages pages of a PDF (blocking; run in pdf_executor).
+    With stop_pattern, pages are read in order and reading stops after the first page that matches.
+    """
+    from pypdf import PdfReader
+
+    reader = PdfReader(path)
+    pages = reader.pages[:max_pages]
+    if len(pages) > 1 and stop_pattern is None:
+        try:
+            return "\n".join(pdf_page_executor.map(lambda p: p.extract_text() or "", pages))
+        except Exception:
+            # Some PDFs share state between pages that isn't thread-safe; retry serially
+            pass
+
+    parts = []
+    for page in pages:
+        parts.append(page.extract_text() or "")  # extract_text() may return None
+        if stop_pattern is not None and stop_pattern.search(parts[-1]):
+            break
+    return "\n".join(parts)
+
 
 @router.get("/wos-mirror/search")
 async def search_wos_mirror(
@@ -130,9 +232,23 @@ async def search_openalex_journals(
         return []
 
 
-@router.get("/publication-metrics")
+# In-flight and recently finished metric fetches per DOI (popup dashboards ask for the same DOI at once)
+_inflight_metrics: Dict[str, asyncio.Task] = {}
+_metrics_cache = TTLCache(maxsize=1024, ttl=60)
+
 
+async def _fetch_both_metrics(clean_doi: str):
+    """Queries OpenAlex and Semantic Scholar concurrently (both clients are blocking)."""
+    return await asyncio.gather(
+        asyncio.to_thread(get_openalex_metrics, doi=clean_doi),
+        asyncio.to_thread(get_semantic_scholar_metrics, clean_doi)
+    )
+
+
+@router.get("/publication-metrics")
+@limiter.limit("30/minute")
 async def get_publication_metrics_by_doi(
+    request: Request,
     doi: str = Query(..., description="DOI of the publication (e.g., 10.1038/s41586-020-2649-2)")
 ) -> Dict[str, Any]:
     """
@@ -156,12 +272,20 @@ async def get_publication_metrics_by_doi(
     
     # Clean DOI if it comes with full URL
     clean_doi = doi.split('doi.org/')[-1] if 'doi.org/' in doi else doi
+    key = clean_doi.lower()
     
-    # Query OpenAlex
-    openalex_data = get_openalex_metrics(doi=clean_doi)
-    
-    # Query Semantic Scholar
-    semantic_scholar_data = get_semantic_scholar_metrics(clean_doi)
+    cached = _metrics_cache.get(key)
+    if cached is not None:
+        openalex_data, semantic_scholar_data = cached
+    else:
+        # Concurrent callers for the same DOI await one shared fetch
+        task = _inflight_metrics.get(key)
+        if task is None or task.done():
+            task = asyncio.create_task(_fetch_both_metrics(clean_doi))
+            _inflight_metrics[key] = task
+            task.add_done_callback(lambda t: _inflight_metrics.pop(key, None) if _inflight_metrics.get(key) is t else None)
+        openalex_data, semantic_scholar_data = await task
+        _metrics_cache[key] = (openalex_data, semantic_scholar_data)
     
     # Build response
     return {
@@ -183,34 +307,31 @@ async def list_existing_dois(
     - URLs from cecan.cl (not DOIs)
     - Null/empty values
     
-    Returns only publications where url_origen contains a valid DOI pattern.
+    Returns only publications where url contains a valid DOI pattern.
     
     Example:
         GET /external/list-dois?limit=20
     """
-    # Query publications with potential DOIs
-    pubs = db.query(Publication.id, Publication.titulo, Publication.url_origen)\
-             .filter(Publication.url_origen.isnot(None))\
+    # Query only rows that look like DOIs (skip cecan.cl URLs) so the limit applies to real results
+    pubs = db.query(Publication.id, Publication.title, Publication.url)\
+             .filter(
+                 Publication.url.isnot(None),  # Renamed from url_origen
+                 ~Publication.url.ilike('%cecan.cl%'),
+                 or_(Publication.url.like('10.%'), Publication.url.ilike('%doi.org/%'))
+             )\
              .limit(limit)\
              .all()
     
-    # Filter and clean DOIs
+    # Clean DOIs
     valid_dois = []
-    for pub_id, titulo, url in pubs:
-        # Skip cecan.cl URLs
-        if 'cecan.cl' in url:
-            continue
-        
-        # Check if it's a valid DOI pattern (starts with 10. or contains doi.org)
-        if url.startswith('10.') or 'doi.org/' in url:
-            # Clean DOI
-            clean_doi = url.split('doi.org/')[-1] if 'doi.org/' in url else url
-            
-            valid_dois.append({
-                "publication_id": pub_id,
-                "title": titulo[:80] + "..." if len(titulo) > 80 else titulo,
-                "doi": clean_doi
-            })
+    for pub_id, title, url in pubs:
+        clean_doi = url.split('doi.org/')[-1] if 'doi.org/' in url else url
+        
+        valid_dois.append({
+            "publication_id": pub_id,
+            "title": title[:80] + "..." if len(title) > 80 else title,
+            "doi": clean_doi
+        })
     
     return {
         "total": len(valid_dois),
@@ -219,7 +340,9 @@ async def list_existing_dois(
 
 
 @router.post("/extract-missing-dois")
+@limiter.limit("5/minute")
 async def extract_dois_from_existing_pdfs(
+    request: Request,
     limit: int = Query(10, description="Number of publications to process"),
     dry_run: bool = Query(False, description="If true, only report what would be done without modifying DB"),
     db: Session = Depends(get_db)
@@ -242,15 +365,12 @@ async def extract_dois_from_existing_pdfs(
     Example:
         POST /external/extract-missing-dois?limit=5&dry_run=true
     """
-    import re
-    from pypdf import PdfReader
-    
     # Find publications without DOI but with PDF
     candidates = db.query(Publication).filter(
-        Publication.path_pdf_local.isnot(None),
+        Publication.local_path.isnot(None), # Renamed from path_pdf_local
         or_(
-            Publication.url_origen.is_(None),
-            Publication.url_origen.like('%cecan.cl%')
+            Publication.url.is_(None), # Renamed from url_origen
+            Publication.url.like('%cecan.cl%')
         )
     ).limit(limit).all()
     
@@ -261,30 +381,33 @@ async def extract_dois_from_existing_pdfs(
         "details": []
     }
     
-    # DOI regex pattern (basic)
-    doi_pattern = re.compile(r'10\.\d{4,}/[^\s]+')
+    # Read PDFs in parallel (up to 3 pages, stopping at the first page with a DOI; usually the first)
+    readable = [pub for pub in candidates if os.path.exists(pub.local_path)]
+    loop = asyncio.get_running_loop()
+    texts = await asyncio.gather(
+        *(loop.run_in_executor(pdf_executor, _extract_pdf_text, pub.local_path, 3, _DOI_PATTERN) for pub in readable),
+        return_exceptions=True
+    )
+    text_by_id = {pub.id: text for pub, text in zip(readable, texts)}
     
     for pub in candidates:
         results["processed"] += 1
-        detail = {"pub_id": pub.id, "title": pub.titulo[:50], "status": "unknown"}
+        detail = {"pub_id": pub.id, "title": pub.title[:50], "status": "unknown"}
         
         try:
             # Check if PDF exists
-            if not os.path.exists(pub.path_pdf_local):
+            if pub.id not in text_by_id:
                 detail["status"] = "pdf_not_found"
                 results["failed"] += 1
                 results["details"].append(detail)
                 continue
             
-            # Read PDF
-            reader = PdfReader(pub.path_pdf_local)
-            text = ""
-            # Extract text from first 3 pages (DOI usually on first page)
-            for page in reader.pages[:3]:
-                text += page.extract_text()
+            text = text_by_id[pub.id]
+            if isinstance(text, Exception):
+                raise text
             
             # Search for DOI
-            doi_matches = doi_pattern.findall(text)
+            doi_matches = _DOI_PATTERN.findall(text)
             
             if doi_matches:
                 # Take the first match
@@ -295,8 +418,7 @@ async def extract_dois_from_existing_pdfs(
                 
                 # Update database if not dry run
                 if not dry_run:
-                    pub.url_origen = f"https://doi.org/{extracted_doi}"
-                    db.commit()
+                    pub.url = f"https://doi.org/{extracted_doi}"
                     detail["updated_db"] = True
                 else:
                     detail["updated_db"] = False
@@ -311,10 +433,19 @@ async def extract_dois_from_existing_pdfs(
         
         results["details"].append(detail)
     
+    # Single commit for the whole batch
+    try:
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error saving extracted DOIs: {str(e)}")
+    
     return results
 
 @router.post("/audit-dois")
+@limiter.limit("5/minute")
 async def audit_doi_links(
+    request: Request,
     limit: int = Query(100, description="Max number of DOIs to check"),
     strategy: str = Query("hybrid", description="Strategy: 'http', 'openalex', or 'hybrid'"),
     db: Session = Depends(get_db)
@@ -334,12 +465,11 @@ async def audit_doi_links(
     Returns:
         Report with valid vs broken links status
     """
-    import requests
-    import concurrent.futures
-    import time
-    
-    # Get publications with DOIs
-    pubs = db.query(Publication).filter(Publication.canonical_doi.isnot(None)).limit(limit).all()
+    # Get publications with DOIs (only the audited columns; results are written back by id)
+    pubs = db.query(Publication.id, Publication.title, Publication.canonical_doi)\
+             .filter(Publication.canonical_doi.isnot(None))\
+             .limit(limit)\
+             .all()
     
     results = {
         "total_checked": 0,
@@ -357,23 +487,6 @@ async def audit_doi_links(
         'Refereer': 'https://scholar.google.com/'
     }
     
-    def check_openalex(clean_doi):
-        """Check against OpenAlex API."""
-        try:
-            url = f"https://api.openalex.org/works/https://doi.org/{clean_doi}"
-            # Polite pool
-            response = requests.get(url, params={"mailto": "admin@cecan.cl"}, timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                metadata = extract_publication_metadata(data)
-                return True, "valid_openalex", metadata
-            elif response.status_code == 404:
-                return False, "not_found_openalex", None
-            else:
-                return False, f"error_openalex_{response.status_code}", None
-        except Exception:
-            return False, "error_openalex_connection", None
-
     def check_http(clean_doi):
         """Fallback HTTP check."""
         url = f"https://doi.org/{clean_doi}"
@@ -394,6 +507,17 @@ async def audit_doi_links(
         # Clean DOI just in case
         clean_doi = doi.split('doi.org/')[-1].strip()
         
+        # Malformed DOIs can't resolve anywhere; don't spend an HTTPS round trip on them
+        if not _DOI_SYNTAX.match(clean_doi):
+            return {
+                "pub_id": pub_id,
+                "title": title[:50],
+                "doi": doi,
+                "status": "broken",
+                "reason": "Malformed DOI",
+                "source": "syntax"
+            }
+        
         status = "unknown"
         source = "none"
         final_url = None
@@ -401,7 +525,7 @@ async def audit_doi_links(
         
         # 1. OpenAlex Check
         if strategy in ["openalex", "hybrid"]:
-            oa_valid, oa_status, oa_metadata = check_openalex(clean_doi)
+            oa_valid, oa_status, oa_metadata = _openalex_lookup(clean_doi)
             if oa_valid:
                 return {
                     "pub_id": pub_id,
@@ -462,54 +586,54 @@ async def audit_doi_links(
                 "final_url": final_url
             }
 
-    # Execute efficiently in parallel
-    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-        futures = {executor.submit(audit_single, p.id, p.titulo, p.canonical_doi): p for p in pubs}
-        
-        for future in concurrent.futures.as_completed(futures):
-            res = future.result()
-            results["total_checked"] += 1
-            results["details"].append(res)
-            
-            # Update DB with status if it's definitive
-            # We do this one by one or batch? Ideally batch but let's do it safely here
-            # Since 'futures' dict has the 'pub' object, we can use it
-            pub_obj = futures[future]
-            
-            if res["status"] == "valid":
-                results["valid"] += 1
-                if "openalex" in res.get("source", ""):
-                    pub_obj.doi_verification_status = "valid_openalex"
-                    results["source_breakdown"]["openalex"] += 1
-                    
-                    # Phase 2: Save Enriched Metrics
-                    if res.get("metadata"):
-                        pub_obj.metrics_data = res["metadata"]
-                        pub_obj.metrics_last_updated = datetime.utcnow()
-                else:
-                    pub_obj.doi_verification_status = "valid_http"
-                    results["source_breakdown"]["http"] += 1
-            elif res["status"] == "broken":
-                pub_obj.doi_verification_status = "broken"
-                results["broken"] += 1
-            elif res["status"] == "warning":
-                 # Treat as valid for now in DB but maybe a distinct status?
-                 # Let's call it "valid_http" to avoid scaring users, or "warning"
-                 pub_obj.doi_verification_status = "valid_http" # Assume valid if blocked
-            
-            # Flush changes periodically or at end?
-            # Doing add/commit inside loop might be slow but safe for concurrency if session is thread-local
-            # But here session is shared. Ideally we collect and bulk update.
-            # For simplicity:
-            db.add(pub_obj)
-            
+    # Run the blocking checks off the event loop, bounded so we don't flood OpenAlex / doi.org
+    async def audit_bounded(pub_id, title, doi):
+        async with _outbound_semaphore():
+            return await asyncio.to_thread(audit_single, pub_id, title, doi)
+
+    audited = await asyncio.gather(*(audit_bounded(*row) for row in pubs))
+    
+    # Collect status changes and write them in one bulk UPDATE pass
+    updates = []
+    for res in audited:
+        results["total_checked"] += 1
+        results["details"].append(res)
+        update = {"id": res["pub_id"]}
+        
+        if res["status"] == "valid":
+            results["valid"] += 1
+            if "openalex" in res.get("source", ""):
+                update["doi_verification_status"] = "valid_openalex"
+                results["source_breakdown"]["openalex"] += 1
+                
+                # Phase 2: Save Enriched Metrics
+                if res.get("metadata"):
+                    update["metrics_data"] = res["metadata"]
+                    update["metrics_last_updated"] = datetime.utcnow()
+            else:
+                update["doi_verification_status"] = "valid_http"
+                results["source_breakdown"]["http"] += 1
+        elif res["status"] == "broken":
+            update["doi_verification_status"] = "broken"
+            results["broken"] += 1
+        elif res["status"] == "warning":
+             # Treat as valid for now in DB but maybe a distinct status?
+             # Let's call it "valid_http" to avoid scaring users, or "warning"
+             update["doi_verification_status"] = "valid_http" # Assume valid if blocked
+        
+        if len(update) > 1:
+            updates.append(update)
+    
+    db.bulk_update_mappings(Publication, updates)
     db.commit()
     
     
     return results
 
 @router.post("/repair-dois")
+@limiter.limit("2/minute")
 async def repair_bad_dois(
+    request: Request,
     limit: int = Query(20, description="Max number of DOIs to attempt repair"),
     db: Session = Depends(get_db)
 ) -> Dict[str, Any]:
@@ -521,76 +645,102 @@ async def repair_bad_dois(
     3. Validates candidates against OpenAlex API.
     4. Automatically updates DB if a better, valid DOI is found.
     """
-    import requests
-    import re
-    import os
-    from pypdf import PdfReader
     from difflib import SequenceMatcher
 
-    def check_openalex(clean_doi):
-        """Verify existence in OpenAlex and return title."""
-        try:
-            url = f"https://api.openalex.org/works/https://doi.org/{clean_doi}"
-            resp = requests.get(url, params={"mailto": "admin@cecan.cl"}, timeout=5)
-            if resp.status_code == 200:
-                data = resp.json()
-                return True, data.get('display_name', '')
-            return False, None
-        except:
-            return False, None
+    def check_openalex_batch(dois):
+        """Verify many DOIs with one filter=doi:a|b|... query per 50. Returns {doi: title} for those found."""
+        found = {}
+        pending = []
+        with _openalex_cache_lock:
+            for d in dict.fromkeys(d.lower() for d in dois):
+                cached = _openalex_cache.get(d)
+                if cached is None:
+                    pending.append(d)
+                elif cached[0]:
+                    found[d] = (cached[2] or {}).get("title") or ""
+        dois = pending
+        for start in range(0, len(dois), 50):
+            chunk = dois[start:start + 50]
+            try:
+                resp = _openalex_session.get(
+                    "https://api.openalex.org/works",
+                    params={
+                        "filter": "doi:" + "|".join(f"https://doi.org/{d}" for d in chunk),
+                        "per-page": 50,
+                        "mailto": "admin@cecan.cl"
+                    },
+                    timeout=10
+                )
+                if resp.status_code != 200:
+                    raise ValueError(f"OpenAlex batch lookup returned {resp.status_code}")
+                works = resp.json().get("results", [])
+            except Exception:
+                # A failed batch says nothing about its DOIs; check them one by one instead
+                for d in chunk:
+                    oa_valid, _, oa_metadata = _openalex_lookup(d)
+                    if oa_valid:
+                        found[d] = (oa_metadata or {}).get("title") or ""
+                continue
+            for work in works:
+                work_doi = (work.get("doi") or "").lower().split("doi.org/")[-1]
+                if work_doi:
+                    found[work_doi] = work.get("display_name", "")
+            # Remember misses; hits are left to _openalex_lookup, which also stores metadata
+            with _openalex_cache_lock:
+                for d in chunk:
+                    if d not in found:
+                        _openalex_cache[d] = (False, "not_found_openalex", None)
+        return found
 
     def titles_match(title1, title2, threshold=0.4):
         """Fuzzy match two titles."""
         if not title1 or not title2: return False
         t1 = title1.lower()
         t2 = title2.lower()
-        ratio = SequenceMatcher(None, t1, t2).ratio()
         
-        # Also check token overlap for better accuracy
+        # Token overlap first: cheap set ops, and enough on its own to accept
         tokens1 = set(t1.split())
         tokens2 = set(t2.split())
         if not tokens1 or not tokens2: return False
         overlap = len(tokens1.intersection(tokens2)) / min(len(tokens1), len(tokens2))
+        if overlap > 0.5:
+            return True
         
-        return ratio > threshold or overlap > 0.5
-    
-    # 1. Regex for DOI Detection (Robust)
-    # Allows for newlines/hyphens inside the suffix
-    # Captures: 10.xxxx / [suffix]
-    doi_pattern_robust = re.compile(r'(10\.\d{4,9}/[-._;()/:a-zA-Z0-9\s]+)')
+        # real_quick_ratio/quick_ratio are cheap upper bounds of ratio(); skip the O(n*m) diff when they fail
+        sm = SequenceMatcher(None, t1, t2)
+        if sm.real_quick_ratio() <= threshold or sm.quick_ratio() <= threshold:
+            return False
+        return sm.ratio() > threshold
     
     # 2. Find Candidates (Bad DOIs)
     # We define "Bad" as:
     # - Shorter than 12 chars (e.g. 10.123/x) -> unlikely to be real mostly
     # - Contains 'xxxxx' or placeholder text
     # - Ends with '/j' (common truncation error we saw)
-    
-    all_pubs = db.query(Publication).filter(Publication.canonical_doi.isnot(None)).all()
+    # The DB keeps this in the generated column doi_is_suspicious (see SUSPICIOUS_DOI_SQL).
+    # Rows whose PDF is gone or whose DOI turns out valid are dropped, so keep reading
+    # id-ordered pages until `limit` candidates are found or the rows run out.
     candidates = []
-    
-    for p in all_pubs:
-        d = p.canonical_doi.strip().lower()
-        is_suspicious = False
-        
-        # 2.1 Explicit Trash Patterns
-        trash_markers = ["xxxxx", "doi", "10.000", "insert", "placeholder"]
-        if any(marker in d for marker in trash_markers):
-             is_suspicious = True
-        
-        # 2.2 Truncation Patterns
-        if d.endswith("/j") or len(d) < 14: # 10.1371/j is 11 chars
-             is_suspicious = True
+    last_id = 0
+    while len(candidates) < limit:
+        page = db.query(Publication).filter(
+            Publication.doi_is_suspicious.is_(True),
+            Publication.local_path.isnot(None), # Renamed from path_pdf_local
+            Publication.id > last_id
+        ).order_by(Publication.id).limit(limit * 3).all()
+        if not page:
+            break
+        last_id = page[-1].id
+        suspicious = [p for p in page if os.path.exists(p.local_path)]
         
         # SAFETY CHECK: If it looks suspicious but is actually valid in OpenAlex, skip it!
-        if is_suspicious:
-             exists, _ = check_openalex(d)
-             if exists:
-                 is_suspicious = False # False alarm, it's a valid short DOI
-             
-        if is_suspicious and p.path_pdf_local and os.path.exists(p.path_pdf_local):
-            candidates.append(p)
-            if len(candidates) >= limit:
-                break
+        # (one batched lookup for all suspicious DOIs instead of one request each, off the event loop)
+        valid_in_openalex = await asyncio.to_thread(check_openalex_batch, [p.canonical_doi.strip() for p in suspicious])
+        candidates.extend(
+            p for p in suspicious
+            if p.canonical_doi.strip().lower() not in valid_in_openalex # False alarm, it's a valid short DOI
+        )
+    candidates = candidates[:limit]
     
     results = {
         "analyzed": 0,
@@ -599,6 +749,70 @@ async def repair_bad_dois(
         "details": []
     }
 
+    def find_better_doi(pub, text):
+        """Returns the first DOI in text that exists in OpenAlex and matches the publication title."""
+        # Clean text lightly
+        text = text.replace("- \n", "").replace("-\n", "") # Fix hyphenation
+        
+        matches = _DOI_PATTERN_ROBUST.findall(text)
+        
+        # Filter and Clean Candidates
+        cleaned_candidates = []
+        
+        for m in matches:
+            # Clean whitespace
+            clean = _WHITESPACE.sub('', m).strip()
+            # Remove trailing punctuation often captured
+            clean = clean.rstrip(".,;:/")
+            
+            # Check it's not the same garbage
+            if clean == pub.canonical_doi:
+                continue
+
+            # Basic validation
+            if len(clean) < 15:
+                continue
+            
+            cleaned_candidates.append(clean)
+        
+        # Verify all candidates with one OpenAlex query, then check titles locally
+        oa_titles = check_openalex_batch(cleaned_candidates[:50])
+        
+        for clean in cleaned_candidates:
+            oa_title = oa_titles.get(clean.lower())
+            if oa_title is None:
+                continue
+            if titles_match(pub.title, oa_title): # Renamed from titulo
+                return clean # Found it!
+            # else: DOI exists but titles don't match (likely a reference)
+        return None
+
+    # 3. Deep PDF Scan, all candidates parsed in parallel off the event loop
+    loop = asyncio.get_running_loop()
+
+    async def resolve(pub, text):
+        # find_better_doi makes blocking OpenAlex calls: run it in a thread, bounded like /audit-dois
+        if isinstance(text, Exception):
+            return text
+        try:
+            async with _outbound_semaphore():
+                return await asyncio.to_thread(find_better_doi, pub, text)
+        except Exception as e:
+            return e
+
+    async def scan(pubs, max_pages):
+        texts = await asyncio.gather(
+            *(loop.run_in_executor(pdf_executor, _extract_pdf_text, pub.local_path, max_pages) for pub in pubs),
+            return_exceptions=True
+        )
+        resolved = await asyncio.gather(*(resolve(pub, text) for pub, text in zip(pubs, texts)))
+        return {pub.id: found for pub, found in zip(pubs, resolved)}
+
+    # The right DOI is usually on the cover page: try page 1 for everyone, then read
+    # up to 20 pages (cover + content usually enough) only for the unresolved ones.
+    outcome = await scan(candidates, 1)
+    outcome.update(await scan([pub for pub in candidates if outcome[pub.id] is None], 21))
+
     for pub in candidates:
         results["analyzed"] += 1
         detail = {
@@ -608,51 +822,16 @@ async def repair_bad_dois(
         }
         
         try:
-            # 3. Deep PDF Scan
-            reader = PdfReader(pub.path_pdf_local)
-            text = ""
-            # Read up to 20 pages (cover + content usually enough)
-            for i, page in enumerate(reader.pages):
-                if i > 20: break
-                text += page.extract_text() + "\n"
-            
-            # Clean text lightly
-            text = text.replace("- \n", "").replace("-\n", "") # Fix hyphenation
-            
-            matches = doi_pattern_robust.findall(text)
-            
-            # Filter and Clean Candidates
-            valid_new_doi = None
-            
-            for m in matches:
-                # Clean whitespace
-                clean = re.sub(r'\s+', '', m).strip()
-                # Remove trailing punctuation often captured
-                clean = clean.rstrip(".,;:/")
-                
-                # Check it's not the same garbage
-                if clean == pub.canonical_doi:
-                    continue
-
-                # Basic validation
-                if len(clean) < 15:
-                    continue
-                
-                # Verify with OpenAlex AND Check Title
-                exists, oa_title = check_openalex(clean)
-                if exists:
-                    if titles_match(pub.titulo, oa_title):
-                        valid_new_doi = clean
-                        break # Found it!
-                    else:
-                        # DOI exists but titles don't match (likely a reference)
-                        continue
+            valid_new_doi = outcome[pub.id]
+            if isinstance(valid_new_doi, Exception):
+                raise valid_new_doi
             
             if valid_new_doi:
-                pub.canonical_doi = valid_new_doi
-                pub.url_origen = f"https://doi.org/{valid_new_doi}"
-                pub.doi_verification_status = "repaired"
-                db.commit()
+                # Savepoint per repair: a DOI that already belongs to another row only fails this one
+                with db.begin_nested():
+                    pub.canonical_doi = valid_new_doi
+                    pub.url = f"https://doi.org/{valid_new_doi}" # Renamed from url_origen
+                    pub.doi_verification_status = "repaired"
                 
                 detail["status"] = "repaired"
                 detail["new_doi"] = valid_new_doi
@@ -667,6 +846,15 @@ async def repair_bad_dois(
             results["failed"] += 1
             
         results["details"].append(detail)
+    
+    # Single commit for all repairs
+    try:
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error saving repaired DOIs: {str(e)}")
+    
+    return results
         
 
 # --- AI JOURNAL ANALYSIS (STATELESS) ---
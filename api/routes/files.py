@@ -1,10 +1,10 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
 from fastapi.responses import FileResponse
 import os
-import shutil
 from datetime import datetime
 from core.security import require_editor
 from core.models import User
+from utils.files import save_upload_file
 
 router = APIRouter(prefix="/files", tags=["Files"])
 
@@ -24,10 +24,11 @@ async def upload_file(
         filename = f"{timestamp}_{safe_filename}"
         file_path = os.path.join(UPLOAD_DIR, filename)
         
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        await save_upload_file(file, file_path)
             
         return {"filename": filename, "path": file_path}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-import shutil
+import asyncio
 import os
 import json
-from sqlalchemy.orm import Session
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
 from typing import List
 
 from core.models import AcademicMember, ResearcherDetails, StudentDetails, MemberType
@@ -10,6 +12,7 @@ from database.session import get_session
 from schemas import AcademicMemberCreate, AcademicMemberUpdate, AcademicMemberOut
 from core.security import require_editor, get_current_user
 from core.models import User
+from utils.files import save_upload_file
 
 router = APIRouter(prefix="/members", tags=["Members"])
 
@@ -28,8 +31,6 @@ async def get_members(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    from sqlalchemy.orm import joinedload
-    
     query = db.query(AcademicMember).options(
         joinedload(AcademicMember.wps),
         joinedload(AcademicMember.researcher_details)
@@ -52,11 +53,18 @@ async def create_member(
     current_user: User = Depends(require_editor),
     db: Session = Depends(get_db)
 ):
-    # Check if RUT or Email exists
-    if member.rut and db.query(AcademicMember).filter(AcademicMember.rut == member.rut).first():
-        raise HTTPException(status_code=400, detail="RUT already registered")
-    if member.email and db.query(AcademicMember).filter(AcademicMember.email == member.email).first():
-        raise HTTPException(status_code=400, detail="Email already registered")
+    # Check if RUT or Email exists (single query for both)
+    conflict_filters = []
+    if member.rut:
+        conflict_filters.append(AcademicMember.rut == member.rut)
+    if member.email:
+        conflict_filters.append(AcademicMember.email == member.email)
+    if conflict_filters:
+        conflict = db.query(AcademicMember.rut, AcademicMember.email).filter(or_(*conflict_filters)).first()
+        if conflict:
+            if member.rut and conflict.rut == member.rut:
+                raise HTTPException(status_code=400, detail="RUT already registered")
+            raise HTTPException(status_code=400, detail="Email already registered")
 
     db_member = AcademicMember(
         rut=member.rut,
@@ -68,7 +76,12 @@ async def create_member(
         is_active=member.is_active
     )
     db.add(db_member)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # Concurrent insert won the race between the check above and this commit
+        db.rollback()
+        raise HTTPException(status_code=400, detail="RUT or Email already registered")
     db.refresh(db_member)
 
     # Add details based on type
@@ -96,7 +109,7 @@ async def upload_documents(
     current_user: User = Depends(require_editor),
     db: Session = Depends(get_db)
 ):
-    member = db.query(AcademicMember).filter(AcademicMember.id == member_id).first()
+    member = db.get(AcademicMember, member_id, options=[joinedload(AcademicMember.student_details)])
     if not member:
         raise HTTPException(status_code=404, detail="Member not found")
     
@@ -114,11 +127,13 @@ async def upload_documents(
         except:
             pass
             
-    for file in files:
+    async def save_one(file: UploadFile):
         file_path = f"{upload_dir}/{file.filename}"
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        saved_paths[file.filename] = file_path
+        await save_upload_file(file, file_path)
+        return file.filename, file_path
+
+    for filename, file_path in await asyncio.gather(*(save_one(f) for f in files)):
+        saved_paths[filename] = file_path
         
     if not member.student_details:
         member.student_details = StudentDetails(member_id=member.id)
@@ -131,7 +146,7 @@ async def upload_documents(
 
 @router.get("/{member_id}", response_model=AcademicMemberOut)
 async def get_member(member_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    member = db.query(AcademicMember).filter(AcademicMember.id == member_id).first()
+    member = db.get(AcademicMember, member_id)
     if not member:
         raise HTTPException(status_code=404, detail="Member not found")
     return member
@@ -143,7 +158,12 @@ async def update_member(
     current_user: User = Depends(require_editor),
     db: Session = Depends(get_db)
 ):
-    db_member = db.query(AcademicMember).filter(AcademicMember.id == member_id).first()
+    # Prefetch both detail rows in the same query; they are mutated below
+    db_member = db.get(
+        AcademicMember,
+        member_id,
+        options=[joinedload(AcademicMember.researcher_details), joinedload(AcademicMember.student_details)]
+    )
     if not db_member:
         raise HTTPException(status_code=404, detail="Member not found")
 
@@ -176,7 +196,7 @@ async def delete_member(
     current_user: User = Depends(require_editor),
     db: Session = Depends(get_db)
 ):
-    db_member = db.query(AcademicMember).filter(AcademicMember.id == member_id).first()
+    db_member = db.get(AcademicMember, member_id)
     if not db_member:
         raise HTTPException(status_code=404, detail="Member not found")
     
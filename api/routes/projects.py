@@ -1,9 +1,12 @@
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
 import os
 import sys
 from pathlib import Path
 
+import orjson
+
 # Ensure backend directory is in sys.path to allow imports if needed
 # (FastAPI usually handles this if run from root/backend)
 
@@ -18,6 +21,26 @@ logger = logging.getLogger(__name__)
 # We need to robustly find the excel file
 EXCEL_FILENAME = "2025_Cronograma Proy Desigualdades_ WP#1 CECAN_20032025 editado.xlsx"
 
+# Parsed Gantt JSON per file path, reused until the Excel file changes: path -> ((mtime_ns, size), bytes)
+_gantt_cache = {}
+
+# Candidate locations, resolved once at import (neither the module location nor the cwd change at runtime)
+_CWD = Path(os.getcwd())
+# Calculate dynamic project root: backend/api/routes/projects.py -> ... -> cecan-agent
+# __file__ is inside routes, so .parent is routes, .parent.parent is api, ...
+# parents[0] = routes, parents[1] = api, parents[2] = backend, parents[3] = cecan-agent
+_PROJECT_ROOT = Path(__file__).resolve().parents[3]
+_EXCEL_SEARCH_PATHS = (
+    _CWD / EXCEL_FILENAME,
+    _CWD / "data" / EXCEL_FILENAME,
+    _PROJECT_ROOT / EXCEL_FILENAME,
+    # Fallback absolute path requested by user
+    Path(r"d:\0 one drive fgortega microsoft\OneDrive - Universidad Católica de Chile\0 antigravity\cecan-agent") / EXCEL_FILENAME
+)
+
+# Resolved Excel location; only a successful lookup is remembered so a file added later is still found
+_excel_path = None
+
 def get_excel_path():
     """
     Locates the Excel file by searching in prioritized paths:
@@ -26,35 +49,24 @@ def get_excel_path():
     3. Project root (dynamically resolved)
     4. Hardcoded absolute path (fallback)
     """
-    filename = EXCEL_FILENAME
-    cwd = Path(os.getcwd())
-    
-    # Calculate dynamic project root: backend/api/routes/projects.py -> ... -> cecan-agent
-    # __file__ is inside routes, so .parent is routes, .parent.parent is api, ...
-    current_file = Path(__file__).resolve()
-    # parents[0] = routes, parents[1] = api, parents[2] = backend, parents[3] = cecan-agent
-    project_root = current_file.parents[3]
+    global _excel_path
+    if _excel_path is not None:
+        return _excel_path
     
-    possible_paths = [
-        cwd / filename,
-        cwd / "data" / filename,
-        project_root / filename,
-         # Fallback absolute path requested by user
-        Path(r"d:\0 one drive fgortega microsoft\OneDrive - Universidad Católica de Chile\0 antigravity\cecan-agent") / filename
-    ]
-    
-    for p in possible_paths:
+    for p in _EXCEL_SEARCH_PATHS:
         if p.exists():
             logger.info(f"Excel file found at: {p}")
-            return str(p)
+            _excel_path = str(p)
+            return _excel_path
             
-    logger.error(f"Excel file not found. Searched in: {[str(p) for p in possible_paths]}")
+    logger.error(f"Excel file not found. Searched in: {[str(p) for p in _EXCEL_SEARCH_PATHS]}")
     return None
 
 @router.get("/projects/wp1/gantt")
-async def get_wp1_gantt_data():
+async def get_wp1_gantt_data(request: Request):
     """
     Returns the parsed Gantt data for WP1 from the Excel file.
+    The ETag follows the file's mtime/size, so unchanged data is answered with 304.
     """
     try:
         # Import here to avoid startup errors if the script has issues
@@ -64,9 +76,30 @@ async def get_wp1_gantt_data():
         if not file_path:
             raise HTTPException(status_code=404, detail="Cronograma Excel file not found")
         
-        parser = ExcelGanttParser(file_path)
-        tasks = parser.parse()
-        return tasks
+        # Parsing the workbook is slow; only redo it when the file changes
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            # Moved since it was located; search again on the next request
+            global _excel_path
+            _excel_path = None
+            raise HTTPException(status_code=404, detail="Cronograma Excel file not found")
+        version = (stat.st_mtime_ns, stat.st_size)
+        headers = {
+            "ETag": f'W/"{stat.st_mtime_ns}-{stat.st_size}"',
+            "Cache-Control": "public, max-age=60"
+        }
+        if request.headers.get("if-none-match") == headers["ETag"]:
+            return Response(status_code=304, headers=headers)
+        
+        cached = _gantt_cache.get(file_path)
+        if cached is None or cached[0] != version:
+            parser = ExcelGanttParser(file_path)
+            tasks = parser.parse()
+            cached = (version, orjson.dumps(tasks))
+            _gantt_cache[file_path] = cached
+        
+        return Response(content=cached[1], media_type="application/json", headers=headers)
     except HTTPException:
         raise
     except Exception as e:
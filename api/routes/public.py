@@ -1,8 +1,14 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel
 from typing import List, Optional
+from collections import defaultdict
+import threading
 from datetime import datetime
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.orm import Session, joinedload, selectinload, load_only
+from cachetools import TTLCache
+import orjson
 
 from database.session import get_db
 from core.models import AcademicMember, ResearcherDetails, Project, Publication, ResearcherPublication, WorkPackage, Journal, JournalCategory
@@ -11,6 +17,44 @@ from services.graph_service import build_graph_data
 
 router = APIRouter(prefix="/public", tags=["Public"])
 
+# Public researcher rows; lambda_stmt caches the built statement so requests skip query construction
+_researcher_rows_stmt = lambda_stmt(
+    lambda: select(
+        AcademicMember.id,
+        AcademicMember.full_name,
+        ResearcherDetails.url_foto,
+        ResearcherDetails.category,
+        WorkPackage.name,
+        ResearcherDetails.indice_h,
+        ResearcherDetails.citaciones_totales
+    )
+    .outerjoin(ResearcherDetails, ResearcherDetails.member_id == AcademicMember.id)
+    .outerjoin(WorkPackage, WorkPackage.id == AcademicMember.wp_id)
+    .where(AcademicMember.member_type == 'researcher', AcademicMember.is_active == True)
+)
+
+_researcher_pub_rows_stmt = lambda_stmt(
+    lambda: select(
+        ResearcherPublication.member_id,
+        Publication.id,
+        Publication.title,
+        Publication.year,
+        Publication.url,
+        Publication.canonical_doi
+    )
+    .join(Publication, Publication.id == ResearcherPublication.publication_id)
+    .join(AcademicMember, AcademicMember.id == ResearcherPublication.member_id)
+    .where(AcademicMember.member_type == 'researcher', AcademicMember.is_active == True)
+    .order_by(ResearcherPublication.id)
+)
+
+# Publication ids per author query in /public/publications (keeps IN lists under driver limits)
+AUTHOR_BATCH_SIZE = 500
+
+# Serialized /public/graph payload; projects and members change rarely
+_graph_cache = TTLCache(maxsize=1, ttl=60)
+_graph_cache_lock = threading.Lock()  # handlers run in the threadpool
+
 # --- Schemas ---
 
 class PublicResearcherMetrics(BaseModel):
@@ -53,59 +97,46 @@ class PublicPublicationOut(BaseModel):
 
 # --- Endpoints ---
 
-@router.get("/researchers", response_model=List[PublicResearcherOut])
-async def get_public_researchers(db: Session = Depends(get_db)):
+# Handlers are plain `def`: the Session is synchronous, so FastAPI runs them in its threadpool
+# instead of blocking the event loop for the whole query.
+# List endpoints return ORJSONResponse directly: rows are built as plain dicts, so skip
+# response_model validation + jsonable_encoder. Schemas stay in `responses` for the docs.
+@router.get("/researchers", responses={200: {"model": List[PublicResearcherOut]}})
+def get_public_researchers(db: Session = Depends(get_db)):
     """
     Get public list of researchers with sanitized fields.
     """
     try:
-        # Fetch researchers with details and WP
-        researchers = (
-            db.query(AcademicMember)
-            .options(
-                joinedload(AcademicMember.researcher_details),
-                joinedload(AcademicMember.wp)
-            )
-            .filter(AcademicMember.member_type == 'researcher')
-            .filter(AcademicMember.is_active == True)
-            .all()
-        )
+        # Publications of every public researcher in one query (PublicationSummarySchema fields only)
+        pubs_by_member = defaultdict(list)
+        for member_id, pub_id, title, year, url, doi in db.execute(_researcher_pub_rows_stmt):
+            pubs_by_member[member_id].append({
+                "id": pub_id,
+                "title": title,
+                "year": year,
+                "url": url,
+                "doi": doi # Map to standardized field
+            })
+        
+        # Researchers with details and WP as plain rows, streamed straight into the output
+        researchers = db.execute(_researcher_rows_stmt)
         
         results = []
-        for member in researchers:
-            details = member.researcher_details
-            wp = member.wp
-            
-            # Fetch publications
-            pubs = []
-            if member.publication_connections:
-                for rp in member.publication_connections:
-                    pub = rp.publication
-                    pubs.append({
-                        "id": pub.id,
-                        "title": pub.title,
-                        "year": pub.year,
-                        "url": pub.url,
-                        "doi": pub.canonical_doi, # Map to standardized field
-                        "canonical_doi": pub.canonical_doi, # Map to field expected by table
-                        "has_funding_ack": pub.has_funding_ack,
-                        "anid_report_status": pub.anid_report_status or "Pending"
-                    })
-            
+        for member_id, full_name, photo_url, category, wp_name, h_index, total_citations in researchers:
             results.append({
-                "id": member.id,
-                "full_name": member.full_name,
-                "photo_url": details.url_foto if details else None,
-                "category": details.category if details else None,
-                "wp_name": wp.name if wp else None,
+                "id": member_id,
+                "full_name": full_name,
+                "photo_url": photo_url,
+                "category": category,
+                "wp_name": wp_name,
                 "metrics": {
-                    "h_index": details.indice_h if details else None,
-                    "total_citations": details.citaciones_totales if details else None
+                    "h_index": h_index,
+                    "total_citations": total_citations
                 },
-                "publications": pubs
+                "publications": pubs_by_member[member_id]
             })
             
-        return results
+        return ORJSONResponse(results)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching researchers: {str(e)}")
@@ -115,57 +146,97 @@ import logging
 # Ensure logger is configured
 logger = logging.getLogger(__name__)
 
-@router.get("/publications", response_model=List[PublicPublicationOut])
-async def get_public_publications(db: Session = Depends(get_db)):
+@router.get("/publications", responses={200: {"model": List[PublicPublicationOut]}})
+def get_public_publications(
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Page size (omit to get every publication)"),
+    offset: int = Query(0, ge=0),
+    year: Optional[str] = Query(None, description="Filter by publication year"),
+    wp_id: Optional[int] = Query(None, description="Only publications with an author in this WP"),
+    db: Session = Depends(get_db)
+):
     """
-    Get public list of publications with authors.
-    Optimized to avoid N+1 queries and handle missing schema columns safely.
+    Get public list of publications with authors, newest first.
+    Optimized to avoid N+1 queries and to load only the serialized columns.
+    Filtering and pagination run in SQL; X-Total-Count has the unpaginated total.
     """
     try:
+        query = db.query(Publication)
+        if year:
+            query = query.filter(Publication.year == year)
+        if wp_id is not None:
+            query = query.filter(Publication.researcher_connections.any(
+                ResearcherPublication.member.has(AcademicMember.wp_id == wp_id)
+            ))
+        total = query.count()
+        
         # 1. Eager loading: Fetch publication, connection, member, AND journal
-        publications = (
-            db.query(Publication)
+        # (only the columns serialized below; skips author_metadata, audit fields, etc.)
+        query = (
+            query
             .options(
-                joinedload(Publication.researcher_connections)
-                .joinedload(ResearcherPublication.member)
-                .joinedload(AcademicMember.researcher_details),
-                joinedload(Publication.journal).joinedload(Journal.categories)  # Load journal and its categories
+                load_only(
+                    Publication.id, Publication.title, Publication.year, Publication.url,
+                    Publication.canonical_doi, Publication.doi_verification_status,
+                    Publication.has_funding_ack, Publication.anid_report_status,
+                    Publication.metrics_data, Publication.metrics_last_updated,
+                    Publication.summary_es, Publication.summary_en,
+                    Publication.ai_journal_analysis, Publication.quartile,
+                    Publication.content, Publication.journal_id
+                ),
+                # Load journal and its categories; categories go through IN so publication rows aren't multiplied
+                joinedload(Publication.journal).selectinload(Journal.categories),
+                selectinload(Publication.impact_metrics)
             )
             .order_by(Publication.id.desc())
-            .all()
+            .offset(offset)
         )
+        if limit is not None:
+            query = query.limit(limit)
+        publications = query.all()
+        
+        # Authors of the fetched publications only, as plain rows (IN batches like selectinload).
+        # The inner join to academic_members skips links whose member is gone (corrupt data).
+        authors_by_pub = defaultdict(list)
+        pub_ids = [pub.id for pub in publications]
+        for start in range(0, len(pub_ids), AUTHOR_BATCH_SIZE):
+            author_rows = (
+                db.query(
+                    ResearcherPublication.publication_id,
+                    AcademicMember.id,
+                    AcademicMember.full_name,
+                    ResearcherDetails.url_foto
+                )
+                .join(AcademicMember, AcademicMember.id == ResearcherPublication.member_id)
+                .outerjoin(ResearcherDetails, ResearcherDetails.member_id == AcademicMember.id)
+                .filter(ResearcherPublication.publication_id.in_(pub_ids[start:start + AUTHOR_BATCH_SIZE]))
+                .order_by(ResearcherPublication.id)
+            )
+            for pub_id, member_id, full_name, avatar_url in author_rows:
+                authors_by_pub[pub_id].append({
+                    "id": member_id,
+                    "full_name": full_name,
+                    "avatar_url": avatar_url
+                })
         
         results = []
         for pub in publications:
-            authors = []
-            # Iterate over connections already loaded in memory
-            for rp in pub.researcher_connections:
-                if not rp.member: continue # Skip if data is corrupt
-                
-                member = rp.member
-                details = member.researcher_details
-                
-                authors.append({
-                    "id": member.id,
-                    "full_name": member.full_name,
-                    # Safe navigation to avoid error if details is None
-                    "avatar_url": details.url_foto if details else None
-                })
+            authors = authors_by_pub[pub.id]
             
             # Serialize journal if exists
+            journal = pub.journal
             journal_data = None
-            if pub.journal:
+            if journal:
                 journal_data = {
-                    "id": pub.journal.id,
-                    "name": pub.journal.name,
-                    "publisher": pub.journal.publisher,
-                    "jif_current": pub.journal.jif_current,
-                    "jif_year": pub.journal.jif_year,
-                    "jif_5year": pub.journal.jif_5year,
-                    "scopus_citescore": pub.journal.scopus_citescore,
-                    "scopus_sjr": pub.journal.scopus_sjr,
-                    "scopus_snip": pub.journal.scopus_snip,
-                    "last_updated": pub.journal.last_updated,
+                    "id": journal.id,
+                    "name": journal.name,
+                    "publisher": journal.publisher,
+                    "jif_current": journal.jif_current,
+                    "jif_year": journal.jif_year,
+                    "jif_5year": journal.jif_5year,
+                    "scopus_citescore": journal.scopus_citescore,
+                    "scopus_sjr": journal.scopus_sjr,
+                    "scopus_snip": journal.scopus_snip,
+                    "last_updated": journal.last_updated,
                     "categories": [
                         {
                             "category_name": cat.category_name,
@@ -174,59 +245,65 @@ async def get_public_publications(db: Session = Depends(get_db)):
                             "percentile": cat.percentile,
                             "ranking": cat.ranking
                         }
-                        for cat in pub.journal.categories
-                    ] if pub.journal.categories else []
+                        for cat in journal.categories
+                    ]
                 }
             
-            # 2. Use getattr to avoid crash if DB is missing new columns
+            impact = pub.impact_metrics
+            
             results.append({
                 "id": pub.id,
                 "title": pub.title,
                 "year": pub.year,
                 "url": pub.url,
-                "doi": getattr(pub, "canonical_doi", None), 
-                "canonical_doi": getattr(pub, "canonical_doi", None),
-                "doi_verification_status": getattr(pub, "doi_verification_status", "pending"),
-                "has_funding_ack": getattr(pub, "has_funding_ack", False),
-                "anid_report_status": getattr(pub, "anid_report_status", "Pending"),
+                "doi": pub.canonical_doi,
+                "canonical_doi": pub.canonical_doi,
+                "doi_verification_status": pub.doi_verification_status,
+                "has_funding_ack": pub.has_funding_ack,
+                "anid_report_status": pub.anid_report_status,
                 # OpenAlex metrics
-                "metrics_data": getattr(pub, "metrics_data", None),
-                "metrics_last_updated": getattr(pub, "metrics_last_updated", None),
+                "metrics_data": pub.metrics_data,
+                "metrics_last_updated": pub.metrics_last_updated,
                 # AI-generated summaries
-                "summary_es": getattr(pub, "summary_es", None),
-                "summary_en": getattr(pub, "summary_en", None),
-                "ai_journal_analysis": getattr(pub, "ai_journal_analysis", None), # Added: AI Journal Analysis
-                "quartile": getattr(pub, "quartile", None), # Added: Dedicated Quartile
-                "content": getattr(pub, "content", None),
+                "summary_es": pub.summary_es,
+                "summary_en": pub.summary_en,
+                "ai_journal_analysis": pub.ai_journal_analysis, # Added: AI Journal Analysis
+                "quartile": pub.quartile, # Added: Dedicated Quartile
+                "content": pub.content,
                 "journal": journal_data,  # ✅ ADDED: Include journal data
                 # Legacy impact metrics
                 "impact_metrics": {
-                    "citation_count": pub.impact_metrics.citation_count if pub.impact_metrics else None,
-                    "is_international_collab": pub.impact_metrics.is_international_collab if pub.impact_metrics else None,
-                    "quartile": pub.impact_metrics.quartile if pub.impact_metrics else None,
-                    "jif": pub.impact_metrics.jif if pub.impact_metrics else None,
-                } if pub.impact_metrics else None,
+                    "citation_count": impact.citation_count,
+                    "is_international_collab": impact.is_international_collab,
+                    "quartile": impact.quartile,
+                    "jif": impact.jif,
+                } if impact else None,
                 "authors": authors
             })
             
-        return results
+        return ORJSONResponse(results, headers={"X-Total-Count": str(total)})
         
     except Exception as e:
         # Log real error to server console
         logger.error(f"CRITICAL ERROR in /public/publications: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error interno: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error fetching publications: {str(e)}")
 
 
 @router.get("/graph")
-async def get_public_graph(db: Session = Depends(get_db)):
+def get_public_graph(db: Session = Depends(get_db)):
     """
     Get simplified graph data for public visualization.
     """
     try:
-        data = build_graph_data(db)
-        # We could filter sensitive data here if needed, but get_graph_data seems already safe enough for now
-        # based on the legacy implementation.
-        return data
+        with _graph_cache_lock:
+            blob = _graph_cache.get("graph")
+        if blob is None:
+            data = build_graph_data(db)
+            # We could filter sensitive data here if needed, but get_graph_data seems already safe enough for now
+            # based on the legacy implementation.
+            blob = orjson.dumps(data)
+            with _graph_cache_lock:
+                _graph_cache["graph"] = blob
+        return Response(content=blob, media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching graph data: {str(e)}")
@@ -3,46 +3,100 @@ Publication Routes for CECAN Platform
 API endpoints for publications and data management
 """
 
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Form, Body
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Form, Body, BackgroundTasks, Query, Response
+from pydantic import TypeAdapter
+from cachetools import TTLCache
+from sqlalchemy.orm import Session, joinedload, load_only
 import threading
 import os
 from datetime import datetime
+import hashlib
 import json
+import logging
+import uuid
+from typing import Optional
 
-from database.session import get_db
+from config import UPLOAD_DIR
+from database.session import get_db, get_session
 from core.security import require_editor, get_current_user
 from core.models import User
 from services import scraper_service, compliance_service, publication_service
 from services.ingestion_service import ingestion_service
-from core.models import Publication, ResearcherPublication, AcademicMember, PublicationImpact, PublicationChunk
+from core.models import Publication, ResearcherPublication, AcademicMember, PublicationImpact, PublicationChunk, Journal, ExternalMetric
 from schemas import PublicationUpdate, PublicationOut
+from utils.files import save_upload_file
 
 router = APIRouter(prefix="/publications", tags=["Publications"])
+logger = logging.getLogger(__name__)
 
+# Validates ORM rows into PublicationOut and dumps JSON straight from pydantic-core
+_publications_adapter = TypeAdapter(list[PublicationOut])
 
-@router.get("", response_model=list[PublicationOut])
-async def get_publications(
+# Candidate DOIs per duplicate check query in /extract-missing-dois (keeps IN lists under driver limits)
+DOI_LOOKUP_BATCH_SIZE = 500
+
+
+# Schema stays in `responses` for the docs; the body is serialized in one pass below
+@router.get("", responses={200: {"model": list[PublicationOut]}})
+def get_publications(
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size (omit to get every publication)"),
+    offset: int = Query(0, ge=0),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get all publications with researcher matches
+    Get all publications with researcher matches, newest first.
+    Pagination runs in SQL; X-Total-Count has the unpaginated total.
     """
     # Use SQLAlchemy to fetch publications with relationships if needed
-    # For now, fetching basic data. 
     # Note: PublicationOut schema handles deserialization if configured correctly, 
     # but let's manualy check the metrics_data usage if it's stored as JSON-in-string or native JSON type in Postgres.
     # In Postgres `JSON` type comes out as dict, so no need for manual deserialization unless it was stored as string.
+    total = db.query(Publication.id).count()
     
-    pubs = db.query(Publication).order_by(Publication.id.desc()).all()
-    # The Pydantic model `PublicationOut` should automatically handle the conversion 
-    # from the ORM model to the JSON response.
-    return pubs
+    # Journal (and its categories) are part of PublicationOut; load them up front instead of
+    # one lazy load per publication while the response is serialized.
+    # Only the serialized columns are read (full PDF text in `content` stays in the DB)
+    query = (
+        db.query(Publication)
+        .options(
+            load_only(
+                Publication.id, Publication.title, Publication.year, Publication.url,
+                Publication.canonical_doi, Publication.enrichment_status,
+                Publication.summary_es, Publication.summary_en,
+                Publication.metrics_data, Publication.journal_id
+            ),
+            joinedload(Publication.journal).selectinload(Journal.categories)
+        )
+        .order_by(Publication.id.desc())
+        .offset(offset)
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    pubs = query.all()
+    # PublicationOut (from_attributes) converts the ORM rows; dumping to JSON bytes directly
+    # skips response_model's second pass through Python objects before the JSON encoder.
+    body = _publications_adapter.dump_json(_publications_adapter.validate_python(pubs, from_attributes=True))
+    return Response(content=body, media_type="application/json", headers={"X-Total-Count": str(total)})
+
+
+# Held while a publications sync runs, so repeated clicks don't start overlapping scrapes
+_sync_lock = threading.Lock()
+
+
+def _run_sync_publications():
+    # Acquired by the task itself, so it can't leak if the task never runs
+    if not _sync_lock.acquire(blocking=False):
+        return  # Another sync started after this request checked
+    try:
+        scraper_service.sync_publications_data()
+    finally:
+        _sync_lock.release()
 
 
 @router.post("/sync")
 async def sync_publications(
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_editor)
 ):
@@ -50,9 +104,14 @@ async def sync_publications(
     Synchronize publications from external sources.
     Requires Editor role.
     """
-    # Run in background
-    thread = threading.Thread(target=scraper_service.sync_publications_data)
-    thread.start()
+    if _sync_lock.locked():
+        return {
+            "status": "running",
+            "message": "Publications synchronization already in progress"
+        }
+    
+    # Run in background (threadpool, after the response is sent)
+    background_tasks.add_task(_run_sync_publications)
     
     return {
         "status": "started",
@@ -61,7 +120,7 @@ async def sync_publications(
 
 
 @router.post("/audit")
-async def run_audit(
+def run_audit(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_editor)
 ):
@@ -76,7 +135,7 @@ async def run_audit(
 
 
 @router.post("/audit/reset")
-async def reset_audit(
+def reset_audit(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_editor)
 ):
@@ -91,42 +150,46 @@ async def reset_audit(
 
 
 @router.post("/extract-missing-dois")
-async def extract_missing_dois(
+def extract_missing_dois(
     dry_run: bool = False,
     force_recheck: bool = False,
     limit: int = 1000,
+    include_details: bool = Query(False, description="Also return one entry per found DOI"),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_editor)
 ):
     """
     Extract DOIs from publications.
+    Returns counts only unless include_details is set.
     """
     from services.publication_service import extract_doi
     from services.openalex_service import extract_doi_from_url
     
     try:
-        query = db.query(Publication)
+        # Plain rows with just the columns used below, streamed 100 at a time, instead of
+        # up to `limit` fully mapped Publications (each with its full text) held at once
+        query = db.query(Publication.id, Publication.title, Publication.content, Publication.canonical_doi)
         
         # If not forcing recheck, only get ones without canonical DOI
         if not force_recheck:
             query = query.filter(Publication.canonical_doi.is_(None))
             
-        publications = query.limit(limit).all()
+        publications = query.limit(limit).yield_per(100)
         
-        total_scanned = len(publications)
+        total_scanned = 0
         dois_found = 0
         dois_updated = 0
         failed = 0
         skipped = 0
         details = []
+        updates = []
         
-        print(f"[Extract DOIs] Processing {total_scanned} publications (dry_run={dry_run})")
-        
-        # Pre-load existing DOIs
-        existing_dois_rows = db.query(Publication.canonical_doi).filter(Publication.canonical_doi.isnot(None)).all()
-        existing_dois = {row[0] for row in existing_dois_rows if row[0]}
+        logger.info("[Extract DOIs] Processing up to %d publications (dry_run=%s)", limit, dry_run)
         
+        # First pass: extract a candidate DOI per publication
+        candidates = []
         for pub in publications:
+            total_scanned += 1
             try:
                 # Use 'content' field instead of 'contenido_texto'
                 has_text = bool(pub.content and len(pub.content) > 50)
@@ -145,45 +208,62 @@ async def extract_missing_dois(
                     match = openalex_service.search_publication_by_title(pub.title)
                     if match and match.get("doi"):
                         doi_url = match.get("doi")
-                        print(f"[Extract DOIs] Recovered DOI by title '{pub.title[:30]}...': {doi_url}")
+                        logger.debug("[Extract DOIs] Recovered DOI by title %.30r: %s", pub.title, doi_url)
                 
                 if doi_url:
                     dois_found += 1
-                    clean_doi = extract_doi_from_url(doi_url)
-                    
-                    if clean_doi in existing_dois and pub.canonical_doi != clean_doi:
-                        skipped += 1
-                        continue
-                    
-                    if not dry_run:
-                        pub.url = doi_url # Renamed from url_origen
-                        pub.canonical_doi = clean_doi
-                        dois_updated += 1
-                        existing_dois.add(clean_doi)
-                    
-                    details.append({
-                        "pub_id": pub.id,
-                        "title": pub.title[:50] if pub.title else "Untitled",
-                        "status": "found" if dry_run else "updated",
-                        "doi": clean_doi
-                    })
+                    candidates.append((pub.id, pub.title, pub.canonical_doi, doi_url, extract_doi_from_url(doi_url)))
             
             except Exception as e:
                 failed += 1
-                print(f"  ✗ Error processing {pub.id}: {str(e)}")
-        
-        # Commit changes if not dry run
-        if not dry_run and dois_updated > 0:
+                logger.warning("[Extract DOIs] Error processing %s: %s", pub.id, e)
+        
+        # Which candidate DOIs are already taken, via the canonical_doi index
+        # (IN batches instead of loading every DOI in the table)
+        candidate_dois = list({c[4] for c in candidates})
+        existing_dois = set()
+        for start in range(0, len(candidate_dois), DOI_LOOKUP_BATCH_SIZE):
+            existing_dois.update(
+                doi for (doi,) in db.query(Publication.canonical_doi)
+                .filter(Publication.canonical_doi.in_(candidate_dois[start:start + DOI_LOOKUP_BATCH_SIZE]))
+            )
+        
+        for pub_id, title, canonical_doi, doi_url, clean_doi in candidates:
+            if clean_doi in existing_dois and canonical_doi != clean_doi:
+                skipped += 1
+                continue
+            
+            if not dry_run:
+                # Renamed from url_origen
+                updates.append({"id": pub_id, "url": doi_url, "canonical_doi": clean_doi})
+                dois_updated += 1
+                existing_dois.add(clean_doi)
+            
+            if include_details:
+                details.append({
+                    "pub_id": pub_id,
+                    "title": title[:50] if title else "Untitled",
+                    "status": "found" if dry_run else "updated",
+                    "doi": clean_doi
+                })
+        
+        # Write all found DOIs in one batched UPDATE and commit if not dry run
+        if not dry_run and updates:
+            db.bulk_update_mappings(Publication, updates)
             db.commit()
         
-        return {
+        result = {
             "status": "completed",
             "dry_run": dry_run,
             "scanned": total_scanned,
             "dois_found": dois_found,
             "dois_updated": dois_updated if not dry_run else 0,
-            "details": details
+            "skipped": skipped,
+            "failed": failed
         }
+        if include_details:
+            result["details"] = details
+        return result
     
     except Exception as e:
         db.rollback()
@@ -193,51 +273,99 @@ async def extract_missing_dois(
         }
 
 
-@router.post("/upload")
+# Upload ingestion jobs, polled via GET /publications/upload/{job_id}; kept for an hour after the upload
+_upload_jobs = TTLCache(maxsize=1024, ttl=3600)
+_upload_jobs_lock = threading.Lock()  # jobs are updated from the threadpool
+
+
+def _set_upload_job(job_id: str, **fields):
+    with _upload_jobs_lock:
+        job = _upload_jobs.get(job_id) or {"job_id": job_id}
+        _upload_jobs[job_id] = {**job, **fields}
+
+
+def _run_upload_ingestion(job_id: str, tmp_path, filename: str, content_sha256: str):
+    """Background half of upload_pdf: ingest the stored upload, then index it for RAG."""
+    _set_upload_job(job_id, status="processing")
+    db = get_session()
+    try:
+        # Delegate complex ingestion logic to service layer
+        # skip_ai ya no es necesario (siempre es True internamente)
+        result = ingestion_service.process_pdf_ingestion(
+            file_path=str(tmp_path),
+            filename=filename,
+            db=db,
+            content_sha256=content_sha256,
+            defer_rag_indexing=True
+        )
+    except Exception as e:
+        logger.exception("Error ingesting upload %s", filename)
+        _set_upload_job(job_id, status="failed", message=str(e))
+        return
+    finally:
+        db.close()
+        # Still there if ingestion stopped early (invalid file, duplicate, error)
+        if tmp_path.exists():
+            os.remove(tmp_path)
+    
+    _set_upload_job(job_id, status="completed", result=result)
+    
+    # Embedding the chunks takes seconds to minutes; the job already reports the publication.
+    # Queued so concurrent uploads are embedded and reloaded into the index together.
+    if result.get("rag_indexed") == "pending":
+        ingestion_service.queue_rag_indexing(result["id"])
+        ingestion_service.flush_rag_queue()
+
+
+@router.post("/upload", status_code=202)
 async def upload_pdf(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
     current_user: User = Depends(require_editor)
 ):
     """
     Upload a PDF publication with data enrichment.
     FASE 1 SIMPLIFICADA: Solo extrae metadata desde OpenAlex.
     Los resúmenes se generan después con /generate-summaries
+    Only the upload itself happens in the request: ingestion (text extraction, OpenAlex,
+    author matching, RAG indexing) runs afterwards as a job polled via /upload/{job_id}.
     """
-    try:
-        content = await file.read()
-        
-        # Delegate complex ingestion logic to service layer
-        # skip_ai ya no es necesario (siempre es True internamente)
-        result = ingestion_service.process_pdf_ingestion(
-            file_content=content, 
-            filename=file.filename, 
-            db=db
-        )
-        
-        return result
-
-    except ValueError as ve:
-        # Validation errors (e.g. invalid PDF)
-        raise HTTPException(status_code=400, detail=str(ve))
+    # Stream the upload to a temp file in 1 MiB chunks (size-capped) instead of reading it into memory;
+    # ingestion parses it from disk and moves it into the publications folder
+    tmp_path = UPLOAD_DIR / f".upload_{uuid.uuid4().hex}.pdf"
+    sha256 = hashlib.sha256()
+    await save_upload_file(file, tmp_path, hasher=sha256)
     
-    except Exception as e:
-        # Unexpected server errors
-        print(f"Error in upload_pdf endpoint: {e}")
-        return {
-            "status": "error",
-            "message": f"Server error processing upload: {str(e)}"
-        }
+    # Reject files that aren't PDFs right away (reads only the header)
+    is_valid, error_msg = publication_service.validate_pdf_file(file.filename, str(tmp_path))
+    if not is_valid:
+        os.remove(tmp_path)
+        raise HTTPException(status_code=400, detail=error_msg)
+    
+    job_id = uuid.uuid4().hex
+    _set_upload_job(job_id, status="queued", filename=file.filename)
+    background_tasks.add_task(_run_upload_ingestion, job_id, tmp_path, file.filename, sha256.hexdigest())
+    
+    return {"job_id": job_id, "status": "queued"}
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=500, detail=f"Error processing PDF: {str(e)}")
+
+@router.get("/upload/{job_id}")
+def get_upload_job(
+    job_id: str,
+    current_user: User = Depends(require_editor)
+):
+    """
+    Status of an upload job: queued, processing, completed (with the ingestion result) or failed.
+    """
+    with _upload_jobs_lock:
+        job = _upload_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Upload job not found")
+    return job
 
 
 @router.delete("/{pub_id}")
-async def delete_publication(
+def delete_publication(
     pub_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_editor)
@@ -247,48 +375,51 @@ async def delete_publication(
     This ensures no foreign key constraint errors occur by removing children first.
     """
     try:
-        # 1. Fetch Publication
-        publication = db.query(Publication).filter(Publication.id == pub_id).first()
-        if not publication:
+        # 1. Fetch Publication (only the PDF path; the row also holds the full extracted text)
+        row = db.query(Publication.local_path).filter(Publication.id == pub_id).first()
+        if not row:
             raise HTTPException(status_code=404, detail="Publication not found")
         
-        local_path = publication.local_path
+        local_path = row.local_path
         
         # 2. Manual Cleanup of Children (Safety First)
+        # Plain DELETE statements in the request's single transaction; nothing is loaded into the session
         # Delete Researcher Connections
-        db.query(ResearcherPublication).filter(ResearcherPublication.publication_id == pub_id).delete()
+        db.query(ResearcherPublication).filter(ResearcherPublication.publication_id == pub_id).delete(synchronize_session=False)
         
         # Delete Impact Metrics
-        db.query(PublicationImpact).filter(PublicationImpact.publication_id == pub_id).delete()
+        db.query(PublicationImpact).filter(PublicationImpact.publication_id == pub_id).delete(synchronize_session=False)
         
         # Delete RAG Chunks
-        from core.models import PublicationChunk
-        db.query(PublicationChunk).filter(PublicationChunk.publication_id == pub_id).delete()
+        db.query(PublicationChunk).filter(PublicationChunk.publication_id == pub_id).delete(synchronize_session=False)
+        
+        # Delete External Metrics (also reference publications.id)
+        db.query(ExternalMetric).filter(ExternalMetric.publication_id == pub_id).delete(synchronize_session=False)
         
         # 3. Delete the Publication itself
-        db.delete(publication)
+        db.query(Publication).filter(Publication.id == pub_id).delete(synchronize_session=False)
         db.commit()
         
         # 4. File Deletion (Post-Commit to ensure DB consistency first)
         if local_path and os.path.exists(local_path):
             try:
                 os.remove(local_path)
-                print(f"   [System] Deleted local PDF: {local_path}")
+                logger.info("Deleted local PDF: %s", local_path)
             except Exception as e:
-                print(f"   [Warning] Could not delete file {local_path}: {e}")
+                logger.warning("Could not delete file %s: %s", local_path, e)
 
         return {"status": "success", "message": f"Publication {pub_id} deleted successfully"}
         
+    except HTTPException:
+        raise
     except Exception as e:
         db.rollback()
-        import traceback
-        traceback.print_exc()
-        print(f"CRITICAL DELETE ERROR: {str(e)}")
+        logger.exception("Error deleting publication %s", pub_id)
         raise HTTPException(status_code=500, detail=f"Error deleting publication: {str(e)}")
 
 
 @router.patch("/{pub_id}", response_model=PublicationOut)
-async def update_publication(
+def update_publication(
     pub_id: int,
     pub_update: PublicationUpdate,
     db: Session = Depends(get_db),
@@ -350,7 +481,7 @@ async def update_publication(
 
 
 @router.post("/{pub_id}/enrich-openalex")
-async def enrich_publication_with_openalex(
+def enrich_publication_with_openalex(
     pub_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_editor)
@@ -406,7 +537,7 @@ async def enrich_publication_with_openalex(
 
 
 @router.post("/sync-metadata")
-async def sync_metadata_batch(
+def sync_metadata_batch(
     target_ids: list[int] = Body(None, embed=True),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_editor)
@@ -414,31 +545,37 @@ async def sync_metadata_batch(
     """
     Batch synchronize metadata (Title, Year, Metrics) from OpenAlex for all publications with DOIs.
     """
-    from services.openalex_service import get_publication_by_doi, extract_publication_metadata
+    from services.openalex_service import (
+        get_publication_by_doi,
+        get_publications_by_dois,
+        extract_doi_from_url,
+        extract_publication_metadata
+    )
     from services import journal_service
     
     query = db.query(Publication).filter(Publication.canonical_doi.isnot(None))
+    if target_ids:
+        query = query.filter(Publication.id.in_(target_ids))
     
     pubs = query.all()
     
     updated_count = 0
     errors_count = 0
     
-    print(f"[Metadata Sync] Processing {len(pubs)} publications...")
+    logger.info("[Metadata Sync] Processing %d publications", len(pubs))
+    
+    # One OpenAlex request per 50 DOIs instead of one per publication
+    prefetched = get_publications_by_dois([pub.canonical_doi for pub in pubs])
     
     import time
     
     for pub in pubs:
-        # Check if target_ids is provided and filter manually (since we did all() above)
-        # Or better, filter in query.
-        if target_ids and pub.id not in target_ids:
-            continue
-
         try:
-             # Basic rate limiting
-             time.sleep(0.2) 
-             
-             data = get_publication_by_doi(pub.canonical_doi)
+             data = prefetched.get(extract_doi_from_url(pub.canonical_doi).lower())
+             if data is None:
+                 # Not in the batch answer: single lookup (with retries), basic rate limiting
+                 time.sleep(0.2)
+                 data = get_publication_by_doi(pub.canonical_doi)
              if not data:
                  raise ValueError("OpenAlex returned no data")
              meta = extract_publication_metadata(data)
@@ -449,7 +586,7 @@ async def sync_metadata_batch(
              changed = False
              
              if meta.get("title") and meta["title"] != pub.title:
-                 print(f"   [Sync] Updating title ID {pub.id}: '{pub.title}' -> '{meta['title']}'")
+                 logger.debug("[Metadata Sync] Updating title ID %s: %r -> %r", pub.id, pub.title, meta["title"])
                  pub.title = meta["title"]
                  changed = True
                  
@@ -472,15 +609,15 @@ async def sync_metadata_batch(
                      if journal and pub.journal_id != journal.id:
                          pub.journal_id = journal.id
                          changed = True
-                         print(f"   [Sync] Linked Journal ID {pub.id}: {journal.name}")
+                         logger.debug("[Metadata Sync] Linked Journal ID %s: %s", pub.id, journal.name)
                  except Exception as je:
-                     print(f"   [Sync] Warning linking journal for {pub.id}: {je}")
+                     logger.warning("[Metadata Sync] Could not link journal for %s: %s", pub.id, je)
              
              if changed or True: # Count as updated if we refreshed metrics
                 updated_count += 1
              
         except Exception as e:
-            print(f"Error syncing pub {pub.id} ({pub.canonical_doi}): {e}")
+            logger.warning("[Metadata Sync] Error syncing pub %s (%s): %s", pub.id, pub.canonical_doi, e)
             errors_count += 1
             
     db.commit()
@@ -514,7 +651,7 @@ def generate_summary(
     if not text_content or len(text_content) < 50:
          chunks = db.query(PublicationChunk).filter(PublicationChunk.publication_id == pub_id).order_by(PublicationChunk.chunk_index).all()
          if chunks:
-             print(f"   [Summary] Reconstructing text from {len(chunks)} chunks for pub {pub_id}")
+             logger.info("[Summary] Reconstructing text from %d chunks for pub %s", len(chunks), pub_id)
              text_content = "\n".join([c.content for c in chunks])
     
     if not text_content or len(text_content) < 50:
@@ -549,9 +686,7 @@ def generate_summary(
             "ai_journal_analysis": journal_analysis
         }
     except Exception as e:
-        print(f"Error generating summary for pub {pub_id}: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error generating summary for pub %s", pub_id)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -578,7 +713,7 @@ def search_publications_in_openalex(
             "count": len(candidates)
         }
     except Exception as e:
-        print(f"Error searching OpenAlex: {e}")
+        logger.exception("Error searching OpenAlex")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -608,13 +743,13 @@ def link_to_openalex(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error linking to OpenAlex: {e}")
+        logger.exception("Error linking pub %s to OpenAlex", pub_id)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # ========== JOURNAL ENRICHMENT ENDPOINT ==========
 @router.post("/journals/{journal_id}/enrich")
-async def enrich_journal_metrics(
+def enrich_journal_metrics(
     journal_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_editor)
@@ -633,7 +768,7 @@ async def enrich_journal_metrics(
     if not journal:
         raise HTTPException(status_code=404, detail=f"Journal with ID {journal_id} not found")
     
-    print(f"\n🔄 [Manual Enrichment] Starting enrichment for Journal ID: {journal_id} - {journal.name}")
+    logger.info("[Manual Enrichment] Starting enrichment for Journal ID: %s - %s", journal_id, journal.name)
     
     try:
         # Call enrichment service
@@ -655,7 +790,7 @@ async def enrich_journal_metrics(
         }
         
     except Exception as e:
-        print(f"❌ [Manual Enrichment] Error: {str(e)}")
+        logger.exception("[Manual Enrichment] Error enriching journal %s", journal_id)
         raise HTTPException(
             status_code=500, 
             detail=f"Failed to enrich journal: {str(e)}"
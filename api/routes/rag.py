@@ -5,9 +5,12 @@ API endpoints for semantic search and knowledge exploration
 
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel
+from sqlalchemy import func
+from sqlalchemy.orm import Session
 
+from database.session import get_db
 from core.security import get_current_user
-from core.models import User
+from core.models import User, Publication, PublicationChunk, ResearcherPublication, AcademicMember
 
 router = APIRouter(prefix="/rag", tags=["RAG & Knowledge"])
 
@@ -18,16 +21,15 @@ class RAGQueryRequest(BaseModel):
 
 
 @router.post("/query")
-async def rag_query(
-    request: RAGQueryRequest
+def rag_query(
+    request: RAGQueryRequest,
+    db: Session = Depends(get_db)
 ):
     """
     Perform semantic search on publication knowledge base.
     Returns relevant chunks and AI-generated synthesis.
     """
     from services.rag_service import get_semantic_engine
-    import sqlite3
-    from config import DB_PATH
     
     engine = get_semantic_engine()
     chunks = engine.search_knowledge(request.query, top_k=5)
@@ -38,42 +40,44 @@ async def rag_query(
             "message": "No se encontraron resultados relevantes."
         }
     
-    # Enrich with publication metadata
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
+    # Enrich with publication metadata (pooled session instead of a new sqlite3 connection per request)
     results = []
     for chunk_content in chunks:
         lines = chunk_content.split('\n', 2)
         pub_title = lines[0].replace('Publicación: ', '') if len(lines) > 0 else "Desconocido"
         content = lines[1].replace('Contenido: ', '') if len(lines) > 1 else chunk_content
         
-        cursor.execute("""
-            SELECT p.id, p.titulo, p.fecha, p.url_origen, p.categoria,
-                   GROUP_CONCAT(i.nombre, ', ') as investigadores
-            FROM Publicaciones p
-            LEFT JOIN Investigador_Publicacion ip ON p.id = ip.publicacion_id
-            LEFT JOIN Investigadores i ON ip.investigador_id = i.id
-            WHERE p.titulo LIKE ?
-            GROUP BY p.id
-            LIMIT 1
-        """, (f'%{pub_title[:30]}%',))
-        
-        pub_data = cursor.fetchone()
+        pub_data = (
+            db.query(Publication.id, Publication.title, Publication.year, Publication.url, Publication.category)
+            .filter(Publication.title.like(f'%{pub_title[:30]}%'))
+            .first()
+        )
         
         if pub_data:
             results.append({
-                "id": pub_data['id'],
-                "titulo": pub_data['titulo'],
-                "fecha": pub_data['fecha'],
-                "url": pub_data['url_origen'],
-                "categoria": pub_data['categoria'],
-                "investigadores": pub_data['investigadores'],
+                "id": pub_data.id,
+                "titulo": pub_data.title,
+                "fecha": pub_data.year,
+                "url": pub_data.url,
+                "categoria": pub_data.category,
+                "investigadores": None,
                 "chunk_relevante": content[:500]
             })
     
-    conn.close()
+    # Researcher names for all matched publications in one query
+    if results:
+        names_by_pub = {}
+        author_rows = (
+            db.query(ResearcherPublication.publication_id, AcademicMember.full_name)
+            .join(AcademicMember, AcademicMember.id == ResearcherPublication.member_id)
+            .filter(ResearcherPublication.publication_id.in_({r["id"] for r in results}))
+            .all()
+        )
+        for pub_id, name in author_rows:
+            names_by_pub.setdefault(pub_id, []).append(name)
+        for r in results:
+            if r["id"] in names_by_pub:
+                r["investigadores"] = ", ".join(names_by_pub[r["id"]])
     
     # Generate synthesis with AI
     from services.agent_service import CecanAgent
@@ -99,21 +103,15 @@ Proporciona una respuesta sintética y precisa."""
 
 
 @router.get("/stats")
-async def get_rag_stats(current_user: User = Depends(get_current_user)):
+def get_rag_stats(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
     """Get RAG system statistics"""
-    import sqlite3
-    from config import DB_PATH
-    
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT COUNT(*) FROM PublicationChunks")
-    total_chunks = cursor.fetchone()[0]
-    
-    cursor.execute("SELECT COUNT(DISTINCT publicacion_id) FROM PublicationChunks")
-    indexed_pubs = cursor.fetchone()[0]
-    
-    conn.close()
+    total_chunks, indexed_pubs = db.query(
+        func.count(PublicationChunk.id),
+        func.count(PublicationChunk.publication_id.distinct())
+    ).one()
     
     return {
         "total_chunks": total_chunks,
@@ -124,28 +122,21 @@ async def get_rag_stats(current_user: User = Depends(get_current_user)):
 
 
 @router.get("/publications-stats")
-async def get_publications_stats(current_user: User = Depends(get_current_user)):
+def get_publications_stats(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
     """Returns statistics about publications and RAG processing"""
-    import sqlite3
-    from config import DB_PATH
-    
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
     # Total publications
-    cursor.execute("SELECT COUNT(*) as total FROM Publicaciones")
-    total_pubs = cursor.fetchone()['total']
+    total_pubs = db.query(func.count(Publication.id)).scalar()
     
     # Publications with content
-    cursor.execute("SELECT COUNT(*) as total FROM Publicaciones WHERE contenido_texto IS NOT NULL AND contenido_texto != ''")
-    pubs_with_content = cursor.fetchone()['total']
+    pubs_with_content = db.query(func.count(Publication.id)).filter(
+        Publication.content.isnot(None), Publication.content != ''
+    ).scalar()
     
     # Total chunks
-    cursor.execute("SELECT COUNT(*) as total FROM PublicationChunks")
-    total_chunks = cursor.fetchone()['total']
-    
-    conn.close()
+    total_chunks = db.query(func.count(PublicationChunk.id)).scalar()
     
     return {
         "total_publicaciones": total_pubs,
@@ -178,7 +169,7 @@ class ChatRequest(BaseModel):
 
 
 @router.post("/chat")
-async def chat_endpoint(
+def chat_endpoint(
     request: ChatRequest
 ):
     """Chat with the CECAN AI agent"""
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 import threading
@@ -12,6 +12,20 @@ from services import scraper_service, matching_service
 
 router = APIRouter(prefix="/researchers", tags=["Researchers"])
 
+# Held while a staff sync / matching run is in progress, so repeated clicks don't start overlapping runs
+_sync_lock = threading.Lock()
+_matching_lock = threading.Lock()
+
+
+def _run_locked(lock: threading.Lock, target):
+    # Acquired by the task itself, so it can't leak if the task never runs
+    if not lock.acquire(blocking=False):
+        return  # Another run started after this request checked
+    try:
+        target()
+    finally:
+        lock.release()
+
 
 @router.get("")
 async def get_researchers(
@@ -84,14 +98,21 @@ async def sync_openalex_metrics(
 
 @router.post("/sync")
 async def sync_staff(
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(require_editor)
 ):
     """
     Synchronize staff data from external sources.
     Requires Editor role.
     """
-    thread = threading.Thread(target=scraper_service.sync_staff_data)
-    thread.start()
+    if _sync_lock.locked():
+        return {
+            "status": "running",
+            "message": "Staff synchronization already in progress"
+        }
+    
+    # Run in background (threadpool, after the response is sent)
+    background_tasks.add_task(_run_locked, _sync_lock, scraper_service.sync_staff_data)
     
     return {
         "status": "started",
@@ -101,14 +122,21 @@ async def sync_staff(
 
 @router.post("/match")
 async def run_matching(
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(require_editor)
 ):
     """
     Run researcher-publication matching algorithm.
     Requires Editor role.
     """
-    thread = threading.Thread(target=matching_service.match_researchers)
-    thread.start()
+    if _matching_lock.locked():
+        return {
+            "status": "running",
+            "message": "Matching process already in progress"
+        }
+    
+    # Run in background (threadpool, after the response is sent)
+    background_tasks.add_task(_run_locked, _matching_lock, matching_service.match_researchers)
     
     return {
         "status": "started",
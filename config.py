@@ -46,11 +46,13 @@ CORS_ORIGINS = [
 APP_TITLE = "CECAN Platform API"
 APP_VERSION = "3.1.0"
 APP_DESCRIPTION = "Professional SaaS platform for cancer research management"
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()  # DEBUG adds per-publication detail in batch jobs
 
 # Standardized Paths
 UPLOAD_DIR = BASE_DIR / "uploads"
 DATA_DIR = BASE_DIR / "data"
 VECTORSTORE_DIR = DATA_DIR / "vectorstore"
+MAX_UPLOAD_SIZE_MB = int(os.getenv("MAX_UPLOAD_SIZE_MB", "50"))
 
 # Ensure directories exist
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,31 @@
+"""
+Logging setup for CECAN Platform
+Request threads enqueue records; one listener thread writes them to stderr
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+
+from config import LOG_LEVEL
+
+
+def setup_logging() -> None:
+    """
+    Route root logging through a QueueHandler so handlers never block request threads
+    on the output stream. Safe to call more than once (e.g. on --reload).
+    """
+    root = logging.getLogger()
+    if any(isinstance(h, logging.handlers.QueueHandler) for h in root.handlers):
+        return
+
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+
+    listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(LOG_LEVEL)
+    listener.start()
+    atexit.register(listener.stop)
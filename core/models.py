@@ -3,7 +3,8 @@ SQLAlchemy Models for CECAN Platform
 Database models implementing authentication, compliance, and administrative management.
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, Text, ForeignKey, DateTime, Enum as SQLEnum, Float, JSON, Date
+from sqlalchemy import create_engine, Column, Computed, Index, Integer, String, Boolean, Text, ForeignKey, DateTime, Enum as SQLEnum, Float, JSON, Date
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 from datetime import datetime
@@ -96,6 +97,17 @@ class JournalCategory(Base):
     journal = relationship("Journal", back_populates="categories")
 
 
+# Predicate for doi_is_suspicious (portable between PostgreSQL and SQLite)
+SUSPICIOUS_DOI_SQL = (
+    "canonical_doi IS NOT NULL AND ("
+    "lower(canonical_doi) LIKE '%xxxxx%' OR lower(canonical_doi) LIKE '%doi%' "
+    "OR lower(canonical_doi) LIKE '%10.000%' OR lower(canonical_doi) LIKE '%insert%' "
+    "OR lower(canonical_doi) LIKE '%placeholder%' "
+    "OR lower(trim(canonical_doi)) LIKE '%/j' "
+    "OR length(trim(canonical_doi)) < 14)"
+)
+
+
 class Publication(Base):
     """Scientific publications with compliance audit fields."""
     __tablename__ = "publications"
@@ -109,6 +121,7 @@ class Publication(Base):
     url = Column(Text, nullable=True) # Renamed from url_origen
     canonical_doi = Column(String(100), unique=True, nullable=True, index=True)  # Normalized DOI
     local_path = Column(Text, nullable=True) # Renamed from path_pdf_local
+    content_sha256 = Column(String(64), unique=True, nullable=True, index=True)  # SHA-256 of the uploaded PDF (duplicate detection)
     content = Column(Text, nullable=True) # Renamed from contenido_texto
     
     # AI-generated summaries
@@ -117,8 +130,8 @@ class Publication(Base):
     
     # Metadata Enrichment
     extracted_orcids = Column(Text, nullable=True)  # Comma-separated list of ORCIDs found in PDF
-    author_metadata = Column(JSON, nullable=True)  # Stores author names and countries from ORCID API
-    ai_journal_analysis = Column(JSON, nullable=True)  # AI-extracted journal metadata and quartile estimation
+    author_metadata = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)  # Stores author names and countries from ORCID API
+    ai_journal_analysis = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)  # AI-extracted journal metadata and quartile estimation
     quartile = Column(String(10), nullable=True, index=True) # Dedicated column for filtering (Q1, Q2, Q3, Q4)
     
     # New Fields for Refactor (Phase 1, 2, 3)
@@ -138,6 +151,9 @@ class Publication(Base):
     
     # DOI Verification (Schema First: Added for Smart Audit)
     doi_verification_status = Column(String(50), default="pending", nullable=False) # pending, valid_openalex, valid_http, broken, repaired
+    # Placeholder/truncated DOI (e.g. 'xxxxx', '10.1371/j'), computed by the DB; drives /external/repair-dois.
+    # persisted=None: STORED on PostgreSQL, VIRTUAL on SQLite (which can't ALTER TABLE ADD a stored column)
+    doi_is_suspicious = Column(Boolean, Computed(SUSPICIOUS_DOI_SQL, persisted=None))
     
     
     # External Metrics (OpenAlex, etc)
@@ -384,9 +400,13 @@ class ProjectResearcher(Base):
 class ResearcherPublication(Base):
     """Many-to-many relationship between academic members and publications."""
     __tablename__ = "researcher_publications"
+    __table_args__ = (
+        # Publication -> authors lookups are answered from the index alone (replaces a single-column publication_id index)
+        Index("ix_researcher_publications_publication_member", "publication_id", "member_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    member_id = Column(Integer, ForeignKey("academic_members.id"), nullable=False)
+    member_id = Column(Integer, ForeignKey("academic_members.id"), nullable=False, index=True)
     publication_id = Column(Integer, ForeignKey("publications.id"), nullable=False)
     match_score = Column(Integer, nullable=True)  # 0-100 confidence score
     match_method = Column(String(50), nullable=True)  # e.g., "exact_name", "fuzzy_match"
@@ -441,7 +461,7 @@ class PublicationChunk(Base):
     __tablename__ = "publication_chunks"
     
     id = Column(Integer, primary_key=True, index=True)
-    publication_id = Column(Integer, ForeignKey("publications.id"), nullable=False)
+    publication_id = Column(Integer, ForeignKey("publications.id"), nullable=False, index=True)
     chunk_index = Column(Integer, nullable=False)  # Sequential index within document
     content = Column(Text, nullable=False)
     embedding = Column(Text, nullable=True)  # Serialized vector (BLOB in SQLite, or JSON)
@@ -0,0 +1,9 @@
+"""
+Rate limiting for CECAN Platform
+Shared slowapi limiter for endpoints that fan out to external APIs
+"""
+
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+
+limiter = Limiter(key_func=get_remote_address)
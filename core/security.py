@@ -1,28 +1,81 @@
 
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from database.session import get_db
 
-from core.models import User, UserRole
-from services.auth_service import AuthService
+from core.models import UserRole
+from services.auth_service import get_user_by_email
 from utils.security import decode_token
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login") # Updated path to match API prefix if needed, usually just /auth/login but checking router prefix
 
+# Resolved users per token, so authenticated requests don't decode + query the DB every time.
+# Entries hold (CurrentUser, exp) and are never served past the token's own expiry; a role
+# change or deactivation made elsewhere takes effect within USER_CACHE_TTL seconds.
+USER_CACHE_TTL = 60
+_user_cache = TTLCache(maxsize=5000, ttl=USER_CACHE_TTL)
+
+# Logged-out tokens (key -> exp), rejected by get_current_user until they expire on their own
+_revoked_tokens = {}
+_revoked_tokens_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """Plain snapshot of the authenticated user (safe to share across requests and threads)."""
+    id: int
+    email: str
+    full_name: Optional[str]
+    role: UserRole
+    is_active: bool
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()[:32]
+
+
+def _is_revoked(cache_key: str) -> bool:
+    with _revoked_tokens_lock:
+        return cache_key in _revoked_tokens
+
+
+def revoke_token(token: str) -> None:
+    """Deny a token for the rest of its lifetime (logout) and drop its cached user."""
+    payload = decode_token(token)
+    if payload is None:
+        return  # Invalid or expired: already rejected
+    
+    cache_key = _token_key(token)
+    now = time.time()
+    with _revoked_tokens_lock:
+        # Forget entries whose token has expired anyway
+        for key in [k for k, exp in _revoked_tokens.items() if exp is not None and exp <= now]:
+            del _revoked_tokens[key]
+        _revoked_tokens[cache_key] = payload.get("exp")
+    _user_cache.pop(cache_key, None)
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
-) -> User:
+) -> CurrentUser:
     """
     Dependency to get the current authenticated user from JWT token.
     
     Raises:
-        HTTPException: If token is invalid or user not found
+        HTTPException: If token is invalid, revoked, or the user is not found or inactive
     
     Returns:
-        User object
+        CurrentUser snapshot
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -30,6 +83,17 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
+    cache_key = _token_key(token)
+    if _is_revoked(cache_key):
+        raise credentials_exception
+    
+    cached = _user_cache.get(cache_key)
+    if cached is not None:
+        user, exp = cached
+        if exp is None or exp > time.time():
+            return user
+        _user_cache.pop(cache_key, None)
+    
     payload = decode_token(token)
     if payload is None:
         raise credentials_exception
@@ -38,13 +102,22 @@ async def get_current_user(
     if email is None:
         raise credentials_exception
     
-    auth_service = AuthService(db)
-    user = auth_service.get_user_by_email(email)
+    user = get_user_by_email(db, email)
     
-    if user is None:
+    if user is None or user.is_active is False:
         raise credentials_exception
     
-    return user
+    current_user = CurrentUser(
+        id=user.id,
+        email=user.email,
+        full_name=user.full_name,
+        role=user.role,
+        is_active=True
+    )
+    # decode_token already rejected expired tokens; the hit path re-checks exp
+    _user_cache[cache_key] = (current_user, payload.get("exp"))
+    
+    return current_user
 
 
 # Role-based access control helpers
@@ -54,7 +127,7 @@ class RoleChecker:
     def __init__(self, allowed_roles: list[UserRole]):
         self.allowed_roles = allowed_roles
     
-    async def __call__(self, current_user: User = Depends(get_current_user)):
+    async def __call__(self, current_user: CurrentUser = Depends(get_current_user)):
         if current_user.role not in self.allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -3,7 +3,7 @@ Database session management for CECAN Platform
 Provides database connection and session handling
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from config import SQLALCHEMY_DATABASE_URL
 
@@ -15,6 +15,20 @@ if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
 # Create engine
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args=connect_args)
 
+if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Tune each pooled SQLite connection once: WAL lets readers run alongside the writer."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")  # persisted in the DB file; a no-op after the first connection
+        # Per-connection: wait up to 5 s for a competing writer (e.g. a background sync) instead of failing with "database is locked"
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA cache_size=-65536")  # 64 MiB
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+        cursor.close()
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -3,26 +3,36 @@ CECAN Platform - Main Application Entry Point
 Professional SaaS platform for cancer research management
 Clean Architecture with modular design
 """
+import importlib
+
 import config
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from slowapi import _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
 
 from config import APP_TITLE, APP_VERSION, APP_DESCRIPTION, CORS_ORIGINS
-from api.routes import (
-    auth, compliance, publications, researchers, rag, dashboard, 
-    members, files, reports, public, catalogs, external, students,
-    enrichment  # ← NUEVO
-)
+from api.routes import __all__ as ROUTE_MODULES
+from core.rate_limit import limiter
+from core.logging_setup import setup_logging
+
+setup_logging()
 
 # Create FastAPI application
 app = FastAPI(
     title=APP_TITLE,
     version=APP_VERSION,
-    description=APP_DESCRIPTION
+    description=APP_DESCRIPTION,
+    default_response_class=ORJSONResponse
 )
 
+# Rate limiting (per client IP) for endpoints that call external APIs
+app.state.limiter = limiter
+app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -32,21 +42,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger responses (public publication/graph lists are big, repetitive JSON)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Include routers
-app.include_router(auth.router, prefix="/api")
-app.include_router(compliance.router, prefix="/api")
-app.include_router(publications.router, prefix="/api")
-app.include_router(enrichment.router, prefix="/api")  # ← NUEVO (antes de /api para evitar conflictos)
-app.include_router(researchers.router, prefix="/api")
-app.include_router(rag.router, prefix="/api")
-app.include_router(dashboard.router, prefix="/api")
-app.include_router(members.router, prefix="/api")
-app.include_router(files.router, prefix="/api")
-app.include_router(reports.router, prefix="/api")
-app.include_router(public.router, prefix="/api")
-app.include_router(catalogs.router, prefix="/api")
-app.include_router(external.router, prefix="/api/external")
-app.include_router(students.router, prefix="/api")
+# Prefix overrides; everything else is mounted under /api.
+# Registration order follows ROUTE_MODULES (enrichment right after publications)
+ROUTER_PREFIXES = {
+    "external": "/api/external",
+}
+
+for module_name in ROUTE_MODULES:
+    module = importlib.import_module(f"api.routes.{module_name}")
+    app.include_router(module.router, prefix=ROUTER_PREFIXES.get(module_name, "/api"))
 
 # Static files and frontend
 # Mount this LAST to avoid overriding API routes
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Migración Simple (SQLite): Agregar columna content_sha256 a publications
+Equivalente a la revisión alembic d0e1f2a3b4c5 (PostgreSQL).
+Ejecutar desde el directorio backend: python3 migrations/add_content_sha256_column.py
+"""
+
+import os
+import sqlite3
+from pathlib import Path
+
+# Buscar cecan.db en el directorio actual (backend), o en DB_PATH si está definido
+DB_PATH = Path(os.getenv("DB_PATH", "cecan.db"))
+
+if not DB_PATH.exists():
+    print(f"❌ Error: No se encuentra {DB_PATH}")
+    print(f"   Directorio actual: {Path.cwd()}")
+    print(f"\n💡 Asegúrate de ejecutar desde el directorio backend:")
+    print(f"   cd backend")
+    print(f"   python3 migrations/add_content_sha256_column.py")
+    exit(1)
+
+print(f"📊 Conectando a: {DB_PATH.absolute()}")
+conn = sqlite3.connect(str(DB_PATH))
+cursor = conn.cursor()
+
+try:
+    # Verificar columnas existentes
+    cursor.execute("PRAGMA table_info(publications)")
+    columns = [col[1] for col in cursor.fetchall()]
+
+    changes = 0
+
+    # Agregar content_sha256 (las filas existentes quedan en NULL)
+    if 'content_sha256' not in columns:
+        print("➕ Agregando columna 'content_sha256'...")
+        cursor.execute("ALTER TABLE publications ADD COLUMN content_sha256 VARCHAR(64)")
+        changes += 1
+    else:
+        print("✓ Columna 'content_sha256' ya existe")
+
+    # Índice único para detectar PDFs duplicados (los NULL no colisionan)
+    cursor.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS ix_publications_content_sha256 "
+        "ON publications (content_sha256)"
+    )
+
+    conn.commit()
+    if changes > 0:
+        print(f"\n✅ Migración completada: {changes} columna(s) agregada(s)")
+    else:
+        print("\n✅ No se requieren cambios")
+
+    # Verificación
+    cursor.execute("SELECT COUNT(*) FROM publications")
+    total = cursor.fetchone()[0]
+    print(f"\n📈 Total publicaciones: {total}")
+
+except Exception as e:
+    print(f"\n❌ Error: {e}")
+    conn.rollback()
+    exit(1)
+finally:
+    conn.close()
+
+print("\n🎉 ¡Listo! Ahora puedes reiniciar el backend.")
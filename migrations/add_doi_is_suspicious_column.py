@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Migración Simple (SQLite): Agregar columna generada doi_is_suspicious
+Equivalente a la revisión alembic a7b8c9d0e1f2 (PostgreSQL).
+Ejecutar desde el directorio backend: python3 migrations/add_doi_is_suspicious_column.py
+"""
+
+import os
+import sqlite3
+from pathlib import Path
+
+# Buscar cecan.db en el directorio actual (backend), o en DB_PATH si está definido
+DB_PATH = Path(os.getenv("DB_PATH", "cecan.db"))
+
+# Mismo predicado que core.models.SUSPICIOUS_DOI_SQL al momento de esta migración
+SUSPICIOUS_DOI_SQL = (
+    "canonical_doi IS NOT NULL AND ("
+    "lower(canonical_doi) LIKE '%xxxxx%' OR lower(canonical_doi) LIKE '%doi%' "
+    "OR lower(canonical_doi) LIKE '%10.000%' OR lower(canonical_doi) LIKE '%insert%' "
+    "OR lower(canonical_doi) LIKE '%placeholder%' "
+    "OR lower(trim(canonical_doi)) LIKE '%/j' "
+    "OR length(trim(canonical_doi)) < 14)"
+)
+
+if not DB_PATH.exists():
+    print(f"❌ Error: No se encuentra {DB_PATH}")
+    print(f"   Directorio actual: {Path.cwd()}")
+    print(f"\n💡 Asegúrate de ejecutar desde el directorio backend:")
+    print(f"   cd backend")
+    print(f"   python3 migrations/add_doi_is_suspicious_column.py")
+    exit(1)
+
+print(f"📊 Conectando a: {DB_PATH.absolute()}")
+conn = sqlite3.connect(str(DB_PATH))
+cursor = conn.cursor()
+
+try:
+    # Verificar columnas existentes (table_xinfo incluye las columnas generadas)
+    cursor.execute("PRAGMA table_xinfo(publications)")
+    columns = [col[1] for col in cursor.fetchall()]
+
+    changes = 0
+
+    # Agregar doi_is_suspicious (VIRTUAL: SQLite no permite agregar columnas STORED con ALTER TABLE)
+    if 'doi_is_suspicious' not in columns:
+        print("➕ Agregando columna 'doi_is_suspicious'...")
+        cursor.execute(
+            "ALTER TABLE publications ADD COLUMN doi_is_suspicious BOOLEAN "
+            f"GENERATED ALWAYS AS ({SUSPICIOUS_DOI_SQL}) VIRTUAL"
+        )
+        changes += 1
+    else:
+        print("✓ Columna 'doi_is_suspicious' ya existe")
+
+    # Índice parcial usado por /external/repair-dois
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS ix_publications_doi_is_suspicious "
+        "ON publications (id) WHERE doi_is_suspicious AND local_path IS NOT NULL"
+    )
+
+    conn.commit()
+    if changes > 0:
+        print(f"\n✅ Migración completada: {changes} columna(s) agregada(s)")
+    else:
+        print("\n✅ No se requieren cambios")
+
+    # Verificación
+    cursor.execute("SELECT COUNT(*) FROM publications WHERE doi_is_suspicious")
+    total = cursor.fetchone()[0]
+    print(f"\n📈 Publicaciones con DOI sospechoso: {total}")
+
+except Exception as e:
+    print(f"\n❌ Error: {e}")
+    conn.rollback()
+    exit(1)
+finally:
+    conn.close()
+
+print("\n🎉 ¡Listo! Ahora puedes reiniciar el backend.")
@@ -12,6 +12,11 @@ from database.session import get_session
 from core.models import Project, WorkPackage, AcademicMember, Node
 from services.rag_service import get_semantic_engine
 
+# GenerativeModel per model name, built once: declaring the tools introspects every tool function.
+# Chat sessions (the conversation history) stay per agent.
+_models = {}
+_models_lock = threading.Lock()
+
 
 class CecanAgent:
     def __init__(self, api_key=None):
@@ -44,11 +49,16 @@ class CecanAgent:
         # Get model name from environment variable
         model_name = os.environ.get("GEMINI_MODEL_NAME", "gemini-2.0-flash-exp")
         
-        self.model = self.genai.GenerativeModel(
-            model_name=model_name,
-            tools=self.tools,
-            system_instruction=self._get_system_instruction()
-        )
+        with _models_lock:
+            self.model = _models.get(model_name)
+            if self.model is None:
+                # Tools only use their own DB sessions and the shared semantic engine,
+                # so the tools bound to the first agent can serve every later chat
+                self.model = _models[model_name] = self.genai.GenerativeModel(
+                    model_name=model_name,
+                    tools=self.tools,
+                    system_instruction=self._get_system_instruction()
+                )
         
         self.chat = self.model.start_chat(enable_automatic_function_calling=True)
 
@@ -1,82 +1,97 @@
+from collections import defaultdict
+
 from sqlalchemy.orm import Session, aliased
-from sqlalchemy import func
+from sqlalchemy import func, select
 from core.models import (
     AcademicMember, ResearcherDetails, Publication, Project,
     WorkPackage, Node, ProjectNode, ProjectOtherWP, IngestionAudit
 )
 
+# Color palettes (Impact Flow)
+WP_COLORS = {
+    1: "#4299E1",  # Blue
+    2: "#48BB78",  # Green
+    3: "#ECC94B",  # Yellow
+    4: "#ED8936",  # Orange
+    5: "#9F7AEA",  # Purple
+}
+DEFAULT_WP_COLOR = "#718096"
+NODE_COLOR = "#E53E3E"  # Red for cancer nodes
+
+# Same colors indexed by WP id, filled with the default for unknown ids
+WP_COLOR_BY_ID = [DEFAULT_WP_COLOR] * (max(WP_COLORS) + 1)
+for _wp_id, _color in WP_COLORS.items():
+    WP_COLOR_BY_ID[_wp_id] = _color
+
+
 class AnalyticsService:
     """Service for calculating metrics and generating analytics data."""
 
     def get_aggregated_metrics(self, db: Session) -> dict:
-        """Returns aggregated metrics (publications, citations, h-index, investigators)."""
-        from core.models import ExternalMetric
+        """
+        Returns aggregated metrics (publications, citations, h-index, investigators).
+        Always computed live; the /metrics route caches the response for a short window.
+        """
+        row = self._query_aggregated_metrics(db)
 
-        # 1. Total publications
-        total_pubs = db.query(func.count(Publication.id)).scalar()
-        
-        # 2. Total citations (Local + External)
-        # Local from researcher_details (historical/manual)
-        local_citations = db.query(func.sum(ResearcherDetails.citaciones_totales)).scalar() or 0
-        
-        # External from external_metrics (author level)
-        # Sum of latest citation_count across all sources/members
-        # Note: This is an approximation. In a production system we'd use a more sophisticated join.
-        latest_external_citations = db.query(func.sum(ExternalMetric.value)).filter(
-            ExternalMetric.metric_type == 'citation_count',
-            ExternalMetric.member_id.isnot(None)
-        ).scalar() or 0
-        
-        # 3. Average H-index (External preferred)
-        # Current logic: Get latest recorded h_index in external_metrics per member
-        ext_hindex = db.query(func.avg(ExternalMetric.value)).filter(
-            ExternalMetric.metric_type == 'h_index',
-            ExternalMetric.value > 0
-        ).scalar()
-        
-        # Fallback to ResearcherDetails if no external h-index yet
-        if not ext_hindex:
-            avg_hindex = db.query(func.avg(ResearcherDetails.indice_h)).filter(
-                ResearcherDetails.indice_h.isnot(None), 
-                ResearcherDetails.indice_h > 0
-            ).scalar() or 0
-        else:
-            avg_hindex = ext_hindex
-        
-        # 4. Total investigators
-        total_investigators = db.query(func.count(AcademicMember.id)).filter(
-            AcademicMember.member_type == 'researcher'
-        ).scalar()
-        
-        # 5. Total active students
-        from core.models import Student, StudentStatus
-        total_students = db.query(func.count(Student.id)).filter(
-            Student.status == StudentStatus.ACTIVE
-        ).scalar() or 0
-        
-        return {
+        total_pubs, local_citations, external_citations, ext_hindex, local_hindex, total_investigators, total_students = row
+        avg_hindex = ext_hindex if ext_hindex else (local_hindex or 0)
+
+        metrics = {
             "total_publicaciones": total_pubs,
-            "total_citas": int(local_citations + latest_external_citations),
-            "indice_h_promedio": round(avg_hindex, 1),
+            "total_citas": int((local_citations or 0) + (external_citations or 0)),
+            "indice_h_promedio": round(float(avg_hindex), 1),
             "total_investigadores": total_investigators,
-            "total_estudiantes": total_students
+            "total_estudiantes": total_students or 0
         }
+        return metrics
+
 
+    def _query_aggregated_metrics(self, db: Session):
+        """Computes the raw dashboard aggregates from the source tables."""
+        from core.models import ExternalMetric, Student, StudentStatus
+
+        # All aggregates as scalar subqueries of a single SELECT (one round-trip)
+        return db.execute(
+            select(
+                # 1. Total publications
+                select(func.count(Publication.id)).scalar_subquery().label("total_pubs"),
+                # 2. Total citations (Local + External)
+                # Local from researcher_details (historical/manual)
+                select(func.sum(ResearcherDetails.citaciones_totales)).scalar_subquery().label("local_citations"),
+                # External from external_metrics (author level)
+                # Sum of latest citation_count across all sources/members
+                # Note: This is an approximation. In a production system we'd use a more sophisticated join.
+                select(func.sum(ExternalMetric.value)).where(
+                    ExternalMetric.metric_type == 'citation_count',
+                    ExternalMetric.member_id.isnot(None)
+                ).scalar_subquery().label("external_citations"),
+                # 3. Average H-index (External preferred)
+                # Current logic: Get latest recorded h_index in external_metrics per member
+                select(func.avg(ExternalMetric.value)).where(
+                    ExternalMetric.metric_type == 'h_index',
+                    ExternalMetric.value > 0
+                ).scalar_subquery().label("ext_hindex"),
+                # Fallback to ResearcherDetails if no external h-index yet
+                select(func.avg(ResearcherDetails.indice_h)).where(
+                    ResearcherDetails.indice_h.isnot(None),
+                    ResearcherDetails.indice_h > 0
+                ).scalar_subquery().label("local_hindex"),
+                # 4. Total investigators
+                select(func.count(AcademicMember.id)).where(
+                    AcademicMember.member_type == 'researcher'
+                ).scalar_subquery().label("total_investigators"),
+                # 5. Total active students
+                select(func.count(Student.id)).where(
+                    Student.status == StudentStatus.ACTIVE
+                ).scalar_subquery().label("total_students"),
+            )
+        ).one()
 
     def get_impact_flow_graph(self, db: Session) -> dict:
         """Returns Sankey diagram data for Impact Flow visualization (WP -> Nodes)."""
-        # Color palettes
-        WP_COLORS = {
-            1: "#4299E1",  # Blue
-            2: "#48BB78",  # Green
-            3: "#ECC94B",  # Yellow
-            4: "#ED8936",  # Orange
-            5: "#9F7AEA",  # Purple
-        }
-        NODE_COLOR = "#E53E3E"  # Red for cancer nodes
-        
         nodes = []
-        links_dict = {}  # (source, target) -> count
+        links_dict = defaultdict(int)  # (source, target) -> count
         wp_set = set()
         node_set = set()
         
@@ -85,27 +100,29 @@ class AnalyticsService:
             if name not in wp_set and name not in node_set:
                 nodes.append({"id": name, "nodeColor": color})
                 
-        # 1. Projects connecting WPs to Nodes
+        # 1. Projects connecting WPs to Nodes (counted in SQL, one row per WP/Node pair)
         results = (
             db.query(
                 WorkPackage.id.label("wp_id"),
                 WorkPackage.name.label("wp_name"), # Renamed from nombre
                 Node.id.label("node_id"),
-                Node.name.label("node_name") # Renamed from nombre
+                Node.name.label("node_name"), # Renamed from nombre
+                func.count(Project.id).label("count")
             )
             .select_from(Project)
             .join(WorkPackage, Project.wp_id == WorkPackage.id)
             .join(ProjectNode, Project.id == ProjectNode.project_id) # Renamed from proyecto_id
             .join(Node, ProjectNode.node_id == Node.id) # Renamed from nodo_id
+            .group_by(WorkPackage.id, WorkPackage.name, Node.id, Node.name)
             .all()
         )
         
-        for wp_id, wp_name, node_id, node_name in results:
+        for wp_id, wp_name, node_id, node_name, count in results:
             if not wp_name or not node_name: continue
             
             # WPs
             if wp_name not in wp_set:
-                ensure_node(wp_name, WP_COLORS.get(wp_id, "#718096"))
+                ensure_node(wp_name, WP_COLOR_BY_ID[wp_id] if 0 <= wp_id < len(WP_COLOR_BY_ID) else DEFAULT_WP_COLOR)
                 wp_set.add(wp_name)
             
             # Nodes
@@ -113,8 +130,7 @@ class AnalyticsService:
                 ensure_node(node_name, NODE_COLOR)
                 node_set.add(node_name)
             
-            link_key = (wp_name, node_name)
-            links_dict[link_key] = links_dict.get(link_key, 0) + 1
+            links_dict[(wp_name, node_name)] += count
 
         # 2. WP -> WP Collaboration (ProjectOtherWP)
         # Assuming ProjectOtherWP connects a Project (which has a WP) to another WP (OtherWP)
@@ -142,15 +158,14 @@ class AnalyticsService:
         
         for src_id, src_name, tgt_id, tgt_name, count in collab_results:
             if src_name not in wp_set:
-                ensure_node(src_name, WP_COLORS.get(src_id, "#718096"))
+                ensure_node(src_name, WP_COLOR_BY_ID[src_id] if 0 <= src_id < len(WP_COLOR_BY_ID) else DEFAULT_WP_COLOR)
                 wp_set.add(src_name)
             
             if tgt_name not in wp_set:
-                ensure_node(tgt_name, WP_COLORS.get(tgt_id, "#718096"))
+                ensure_node(tgt_name, WP_COLOR_BY_ID[tgt_id] if 0 <= tgt_id < len(WP_COLOR_BY_ID) else DEFAULT_WP_COLOR)
                 wp_set.add(tgt_name)
                 
-            link_key = (src_name, tgt_name)
-            links_dict[link_key] = links_dict.get(link_key, 0) + count
+            links_dict[(src_name, tgt_name)] += count
 
         # Format links
         links = [
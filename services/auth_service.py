@@ -5,6 +5,7 @@ Business logic for user authentication and authorization
 
 from datetime import timedelta
 from typing import Optional
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
 
 from core.models import User, UserRole
@@ -15,6 +16,14 @@ from utils.security import (
 )
 from config import JWT_EXPIRATION_MINUTES
 
+# Built once; per-request lookups only bind the email
+_user_by_email_stmt = select(User).where(User.email == bindparam("email")).limit(1)
+
+
+def get_user_by_email(db: Session, email: str) -> Optional[User]:
+    """Get user by email (hot path for token authentication)"""
+    return db.scalar(_user_by_email_stmt, {"email": email})
+
 
 class AuthService:
     """Service for authentication operations"""
@@ -85,4 +94,4 @@ class AuthService:
     
     def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
-        return self.db.query(User).filter(User.email == email).first()
+        return get_user_by_email(self.db, email)
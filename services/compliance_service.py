@@ -1,20 +1,23 @@
 
 import re
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, update
 from core.models import Publication
 
-def run_full_audit(db: Session) -> None:
+AUDIT_BATCH_SIZE = 1000
+
+def run_full_audit(db: Session) -> dict:
     """
     Realiza una auditoría completa de todas las publicaciones para verificar
     el cumplimiento de agradecimientos (FONDAP, CECAN).
     
+    Recorre las publicaciones en páginas de AUDIT_BATCH_SIZE (solo id y contenido)
+    y escribe cada página con dos UPDATE ... WHERE id IN (...) y un commit.
+    
     Actualiza:
     - has_funding_ack (Boolean)
     - anid_report_status (String: 'Compliant' | 'Review')
     """
-    publications = db.query(Publication).all()
-    
     # Patrones Regex
     patterns = {
         "FONDAP": r"FONDAP|1523A0004",
@@ -22,24 +25,60 @@ def run_full_audit(db: Session) -> None:
         "ANID": r"ANID|Agencia Nacional"
     }
     
-    for pub in publications:
-        text = pub.content if pub.content else ""
-        
-        # Búsqueda de patrones
-        has_fondap = bool(re.search(patterns["FONDAP"], text, re.IGNORECASE))
-        has_cecan = bool(re.search(patterns["CECAN"], text, re.IGNORECASE))
-        # has_anid = bool(re.search(patterns["ANID"], text, re.IGNORECASE)) # Buscado pero la regla de negocio usa FONDAP/CECAN
+    summary = {"total_audited": 0, "compliant": 0, "review": 0}
+    last_id = 0
+    
+    while True:
+        batch = (
+            db.query(Publication.id, Publication.content)
+            .filter(Publication.id > last_id)
+            .order_by(Publication.id)
+            .limit(AUDIT_BATCH_SIZE)
+            .all()
+        )
+        if not batch:
+            break
         
-        # Regla de Negocio
-        if has_fondap or has_cecan:
-            pub.has_funding_ack = True
-            pub.anid_report_status = "Compliant"
-        else:
-            pub.has_funding_ack = False
-            pub.anid_report_status = "Review"
+        compliant_ids = []
+        review_ids = []
+        for pub_id, content in batch:
+            text = content if content else ""
             
-    # Commit en batch al final
-    db.commit()
+            # Búsqueda de patrones
+            has_fondap = bool(re.search(patterns["FONDAP"], text, re.IGNORECASE))
+            has_cecan = bool(re.search(patterns["CECAN"], text, re.IGNORECASE))
+            # has_anid = bool(re.search(patterns["ANID"], text, re.IGNORECASE)) # Buscado pero la regla de negocio usa FONDAP/CECAN
+            
+            # Regla de Negocio
+            if has_fondap or has_cecan:
+                compliant_ids.append(pub_id)
+            else:
+                review_ids.append(pub_id)
+        
+        if compliant_ids:
+            db.execute(
+                update(Publication)
+                .where(Publication.id.in_(compliant_ids))
+                .values(has_funding_ack=True, anid_report_status="Compliant")
+                .execution_options(synchronize_session=False)
+            )
+        if review_ids:
+            db.execute(
+                update(Publication)
+                .where(Publication.id.in_(review_ids))
+                .values(has_funding_ack=False, anid_report_status="Review")
+                .execution_options(synchronize_session=False)
+            )
+        
+        # Commit por página
+        db.commit()
+        
+        summary["compliant"] += len(compliant_ids)
+        summary["review"] += len(review_ids)
+        summary["total_audited"] += len(batch)
+        last_id = batch[-1][0]
+    
+    return {"summary": summary}
 
 def reset_audit_status(db: Session) -> None:
     """
@@ -1,3 +1,5 @@
+from collections import defaultdict
+
 from sqlalchemy.orm import Session
 from core.models import (
     AcademicMember, ResearcherDetails, Project,
@@ -97,29 +99,41 @@ def build_graph_data(db: Session):
         )
 
     # 4. Projects
-    projects = db.query(Project).all()
-    for proj in projects:
-        node_id = f"proj_{proj.id}"
+    # Plain (column, ...) tuples unpacked positionally; links are fetched once instead of per project
+    researcher_links = defaultdict(list)
+    for project_id, member_id, role in (
+        db.query(ProjectResearcher.project_id, ProjectResearcher.member_id, ProjectResearcher.role)
+        .order_by(ProjectResearcher.id)
+    ):
+        researcher_links[project_id].append((member_id, role))
+
+    node_links = defaultdict(list)
+    for project_id, linked_node_id in db.query(ProjectNode.project_id, ProjectNode.node_id).order_by(ProjectNode.id):
+        node_links[project_id].append(linked_node_id)
+
+    projects = db.query(Project.id, Project.title, Project.wp_id).all()
+    for proj_id, proj_title, proj_wp_id in projects:
+        node_id = f"proj_{proj_id}"
         # Renamed from titulo -> title
-        label = proj.title[:30] + "..." if len(proj.title) > 30 else proj.title
+        label = proj_title[:30] + "..." if len(proj_title) > 30 else proj_title
         add_node(
             node_id,
             label=label,
-            title=proj.title,
+            title=proj_title,
             group="project",
-            data={"type": "Proyecto", "nombre": proj.title, "title": proj.title},
+            data={"type": "Proyecto", "nombre": proj_title, "title": proj_title},
             color="#6ee7b7"
         )
 
         # Edge: Project -> WP
-        if proj.wp_id:
-            target_id = f"wp_{proj.wp_id}"
+        if proj_wp_id:
+            target_id = f"wp_{proj_wp_id}"
             add_edge(node_id, target_id, color={"color": "#a5b4fc", "opacity": 0.5}, width=2)
         
         # Edge: Project -> Researcher
-        for pr in proj.researcher_connections:
-            target_inv_id = f"inv_{pr.member_id}"
-            is_responsable = pr.role == 'Responsable' # Renamed from rol
+        for member_id, role in researcher_links[proj_id]:
+            target_inv_id = f"inv_{member_id}"
+            is_responsable = role == 'Responsable' # Renamed from rol
             add_edge(
                 node_id, 
                 target_inv_id,
@@ -128,9 +142,9 @@ def build_graph_data(db: Session):
             )
             
         # Edge: Project -> Node
-        for pn in proj.node_connections:
+        for linked_node_id in node_links[proj_id]:
             # Renamed from nodo_id -> node_id
-            target_node_id = f"nodo_{pn.node_id}"
+            target_node_id = f"nodo_{linked_node_id}"
             add_edge(node_id, target_node_id, color={"color": "#a5f3fc", "opacity": 0.5}, width=1)
 
     return {"nodes": nodes, "edges": edges}
@@ -1,14 +1,26 @@
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import json
+import logging
 
-from core.models import AcademicMember, ResearcherDetails, Publication, ExternalMetric, IngestionAudit
+from core.models import AcademicMember, ResearcherDetails, Publication, ExternalMetric, IngestionAudit, ResearcherPublication
 from services.scraper_service import get_openalex_metrics, get_semantic_scholar_metrics
 from services import publication_service
 from services import journal_service
 from services.openalex_service import get_publication_by_doi, extract_publication_metadata
 import os
+import shutil
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Uploaded publications waiting for RAG indexing, drained RAG_BATCH_SIZE at a time by flush_rag_queue
+RAG_BATCH_SIZE = 32
+_rag_queue: List[int] = []
+_rag_queue_lock = threading.Lock()
+_rag_flush_lock = threading.Lock()  # held by the thread currently draining the queue
 
 class IngestionService:
     """Service to orchestrate data ingestion from external APIs."""
@@ -64,34 +76,96 @@ class IngestionService:
 
         return {"status": "success", "synced": results}
 
-    def process_pdf_ingestion(self, file_content: bytes, filename: str, db: Session, skip_ai: bool = False) -> Dict[str, Any]:
+    def _duplicate_response(self, pub_id: int) -> Dict[str, Any]:
+        return {
+            "id": pub_id,
+            "status": "duplicate",
+            "message": f"Publication duplicate: ID {pub_id}"
+        }
+
+    def index_publication(self, pub_id: int) -> bool:
+        """
+        Chunk and embed a stored publication for RAG search. Uses its own session,
+        so it can run as a background task after the upload response.
+        """
+        try:
+            from services.rag_service import get_semantic_engine
+            engine = get_semantic_engine()
+            # Assuming process_single_publication returns dict with 'success'
+            rag_result = engine.process_single_publication(pub_id)
+            rag_indexed = rag_result.get("success", False)
+            logger.info("[Ingestion] RAG Indexed pub %s: %s", pub_id, rag_indexed)
+            return rag_indexed
+        except Exception as e:
+            logger.warning("[Ingestion] RAG Indexing failed for pub %s: %s", pub_id, e)
+            return False
+
+    def queue_rag_indexing(self, pub_id: int) -> None:
+        """Add a stored publication to the RAG indexing queue (see flush_rag_queue)."""
+        with _rag_queue_lock:
+            _rag_queue.append(pub_id)
+
+    def flush_rag_queue(self) -> None:
+        """
+        Index every queued publication for RAG search, in batches, in the calling thread.
+        Returns at once if another thread is already draining the queue: it indexes these too,
+        so uploads finishing close together share embedding requests and one index reload.
+        """
+        while _rag_flush_lock.acquire(blocking=False):
+            try:
+                while True:
+                    with _rag_queue_lock:
+                        batch = _rag_queue[:RAG_BATCH_SIZE]
+                        del _rag_queue[:RAG_BATCH_SIZE]
+                    if not batch:
+                        break
+                    self._index_publication_batch(batch)
+            finally:
+                _rag_flush_lock.release()
+            # Publications queued between the last check and the release would otherwise wait for the next upload
+            with _rag_queue_lock:
+                if not _rag_queue:
+                    return
+
+    def _index_publication_batch(self, pub_ids: List[int]) -> None:
+        try:
+            from services.rag_service import get_semantic_engine
+            results = get_semantic_engine().process_publications_batch(pub_ids)
+            for pub_id in pub_ids:
+                logger.info("[Ingestion] RAG Indexed pub %s: %s", pub_id, results.get(pub_id, {}).get("success", False))
+        except Exception as e:
+            logger.warning("[Ingestion] RAG Indexing failed for pubs %s: %s", pub_ids, e)
+
+    def process_pdf_ingestion(self, file_path: str, filename: str, db: Session, skip_ai: bool = False, content_sha256: Optional[str] = None, defer_rag_indexing: bool = False) -> Dict[str, Any]:
         """
         Orchestrate PDF ingestion process: Validation -> Upload -> Enrichment -> Save.
+        `file_path` is the already-uploaded PDF; it is parsed from disk and moved into
+        the publications folder, so the file is never held in memory as a whole.
+        `content_sha256` (hex digest of the file) identifies re-uploads of the same PDF.
+        With `defer_rag_indexing`, "rag_indexed" is "pending" and the caller queues it (queue_rag_indexing).
         """
         # 1. Validate PDF
-        is_valid, error_msg = publication_service.validate_pdf_file(filename, file_content)
+        is_valid, error_msg = publication_service.validate_pdf_file(filename, file_path)
         if not is_valid:
             raise ValueError(error_msg)
         
         clean_title = filename.replace('.pdf', '').replace('_', ' ')
         
-        # 2. Check duplicate by title
-        existing_pub = db.query(Publication).filter(
-            Publication.title == clean_title
-        ).first()
-        
-        if existing_pub:
-            return {
-                "id": existing_pub.id,
-                "status": "duplicate",
-                "message": f"Publication duplicate: ID {existing_pub.id}"
-            }
+        # 2. Check duplicate by file content (unique index lookup; catches renamed files
+        # before any parsing or OpenAlex calls)
+        if content_sha256:
+            existing_pub = db.query(Publication.id).filter(
+                Publication.content_sha256 == content_sha256
+            ).first()
+            
+            if existing_pub:
+                return self._duplicate_response(existing_pub.id)
         
         # 3. Enrich data (Parses PDF, Extracts Authors/DOI)
         # FASE 1: Solo metadatos desde OpenAlex (SIN análisis de IA)
         # La IA se ejecutará después manualmente via endpoint /generate-summaries
         enriched_data = publication_service.enrich_publication_data(
-            file_content, 
+            file_path, 
             filename, 
             db, 
             skip_ai=True  # ← SIEMPRE True ahora (FASE 1 simplificada)
@@ -114,12 +188,15 @@ class IngestionService:
         pdf_directory = "data/publications"
         os.makedirs(pdf_directory, exist_ok=True)
         safe_filename = filename.replace(' ', '_').replace('/', '_')
-        file_path = os.path.join(pdf_directory, safe_filename)
+        saved_path = os.path.join(pdf_directory, safe_filename)
+        if os.path.exists(saved_path) and content_sha256:
+            # Different PDF with the same name; don't overwrite the other publication's file
+            saved_path = os.path.join(pdf_directory, f"{content_sha256[:12]}_{safe_filename}")
         
-        with open(file_path, 'wb') as f:
-            f.write(file_content)
+        shutil.move(file_path, saved_path)
+        file_path = saved_path
         
-        print(f"   [Ingestion] Saved PDF to: {file_path}")
+        logger.info("[Ingestion] Saved PDF to: %s", file_path)
         
         # Determine authors string
         author_names = []
@@ -139,7 +216,7 @@ class IngestionService:
         
         if canonical_doi_value:
             try:
-                print(f"   [Ingestion] Fetching OpenAlex metadata for DOI: {canonical_doi_value}")
+                logger.info("[Ingestion] Fetching OpenAlex metadata for DOI: %s", canonical_doi_value)
                 openalex_data = get_publication_by_doi(canonical_doi_value)
                 metrics_data = extract_publication_metadata(openalex_data)
                 doi_verification_status = "valid_openalex"
@@ -152,7 +229,7 @@ class IngestionService:
                         clean_title = metrics_data["title"]
 
             except Exception as e:
-                print(f"   [Ingestion] ⚠️ Could not fetch OpenAlex metadata: {e}")
+                logger.warning("[Ingestion] Could not fetch OpenAlex metadata: %s", e)
         
         # 6. Extract ORCIDs from PDF hyperlinks
         try:
@@ -164,11 +241,11 @@ class IngestionService:
             # Let's check logic. It printed "Found ... ORCIDs". And "author_metadata".
             # It seems it was for debugging or future use?
             # I will include the extraction and print.
-            orcids_list = extract_orcids_from_pdf_hyperlinks(file_content)
+            orcids_list = extract_orcids_from_pdf_hyperlinks(file_path)
             if orcids_list:
-                print(f"   [Ingestion] Found {len(orcids_list)} ORCIDs in PDF hyperlinks: {orcids_list}")
+                logger.info("[Ingestion] Found %d ORCIDs in PDF hyperlinks: %s", len(orcids_list), orcids_list)
         except Exception as e:
-            print(f"   [Ingestion] ⚠️ ORCID extraction warning: {e}")
+            logger.warning("[Ingestion] ORCID extraction warning: %s", e)
         
         # 6.5 Extract Journal Name and Publisher from OpenAlex (NO vincular aún)
         detected_journal_name = None
@@ -179,9 +256,9 @@ class IngestionService:
             if metrics_data and metrics_data.get("primary_location", {}).get("source"):
                  detected_journal_name = metrics_data["primary_location"]["source"].get("display_name")
                  publisher = metrics_data["primary_location"]["source"].get("host_organization_name")
-                 print(f"   [Ingestion] Journal from OpenAlex: {detected_journal_name} ({publisher})")
+                 logger.info("[Ingestion] Journal from OpenAlex: %s (%s)", detected_journal_name, publisher)
         except Exception as e:
-            print(f"   [Ingestion] ⚠️ Journal extraction failed: {e}")
+            logger.warning("[Ingestion] Journal extraction failed: %s", e)
 
         # 7. Create Publication Record (FASE 1: Solo metadata)
         new_pub = Publication(
@@ -196,6 +273,8 @@ class IngestionService:
             summary_es=None,
             summary_en=None,
             
+            content_sha256=content_sha256,
+            
             # Campos de OpenAlex
             canonical_doi=canonical_doi_value,
             doi_verification_status=doi_verification_status,
@@ -207,40 +286,47 @@ class IngestionService:
             publisher_temp=publisher,  # ← Guardar temporalmente
         )
         # Wait, if `content` is huge, verification needed.
-        new_pub.content = enriched_data.get("text", "")  # Assign full extracted text
+        new_pub_content = enriched_data.get("text") or ""
+        new_pub.content = new_pub_content  # Assign full extracted text
         
         db.add(new_pub)
-        db.commit()
-        db.refresh(new_pub)
+        try:
+            # Flush (not commit) to get the id; the links below go in the same transaction
+            db.flush()
+        except IntegrityError:
+            # Same PDF committed by a concurrent upload since the check above
+            db.rollback()
+            existing_pub = db.query(Publication.id).filter(
+                Publication.content_sha256 == content_sha256
+            ).first() if content_sha256 else None
+            if not existing_pub:
+                raise
+            os.remove(file_path)
+            return self._duplicate_response(existing_pub.id)
+        pub_id = new_pub.id
         
-        # 8. Create Researcher Connections
-        for member_id in enriched_data["matched_author_ids"]:
-            from core.models import ResearcherPublication 
-            conn = ResearcherPublication(
-                publication_id=new_pub.id,
-                member_id=member_id,
-                match_method="auto_ai" if not skip_ai else "auto_keyword",
-                match_score=enriched_data.get("match_score", 80)
-            )
-            db.add(conn)
+        # 8. Create Researcher Connections (one multi-row INSERT)
+        if enriched_data["matched_author_ids"]:
+            db.bulk_insert_mappings(ResearcherPublication, [
+                {
+                    "publication_id": pub_id,
+                    "member_id": member_id,
+                    "match_method": "auto_ai" if not skip_ai else "auto_keyword",
+                    "match_score": enriched_data.get("match_score", 80)
+                }
+                for member_id in enriched_data["matched_author_ids"]
+            ])
         
+        # Publication + links in a single commit
         db.commit()
         
-        # 9. RAG Indexing
+        # 9. RAG Indexing (chunking + embeddings; slow, so callers may run it after responding)
         rag_indexed = False
-        try:
-            from services.rag_service import get_semantic_engine
-            if new_pub.content and len(new_pub.content) > 100:
-                engine = get_semantic_engine()
-                # Assuming process_single_publication returns dict with 'success'
-                rag_result = engine.process_single_publication(new_pub.id)
-                rag_indexed = rag_result.get("success", False)
-                print(f"   [Ingestion] RAG Indexed: {rag_indexed}")
-        except Exception as e:
-            print(f"   [Ingestion] ⚠️ RAG Indexing failed: {e}")
+        if len(new_pub_content) > 100:
+            rag_indexed = "pending" if defer_rag_indexing else self.index_publication(pub_id)
         
         return {
-            "id": new_pub.id,
+            "id": pub_id,
             "status": "success",
             "message": f"Publication uploaded: {clean_title}",
             "rag_indexed": rag_indexed
@@ -279,7 +365,7 @@ class IngestionService:
         """
         Orchestrates full sync for all active researchers.
         """
-        print(f"[{datetime.utcnow()}] Starting weekly external metrics sync...")
+        logger.info("Starting weekly external metrics sync")
         researchers = db.query(AcademicMember).filter(AcademicMember.member_type == 'researcher', AcademicMember.is_active == True).all()
         
         summary = {
@@ -311,7 +397,7 @@ class IngestionService:
         db.add(audit)
         db.commit()
 
-        print(f"[{datetime.utcnow()}] Sync completed. Processed: {summary['processed']}, Errors: {summary['errors']}")
+        logger.info("Sync completed. Processed: %d, Errors: %d", summary["processed"], summary["errors"])
         return summary
 
 # Global instance
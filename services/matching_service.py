@@ -1,7 +1,7 @@
-import sqlite3
 import re
 from thefuzz import fuzz
-from config import DB_PATH
+from database.session import get_session
+from core.models import AcademicMember, Publication, ResearcherPublication
 
 def normalize_text(text):
     if not text: return ""
@@ -9,57 +9,74 @@ def normalize_text(text):
 
 def match_researchers():
     print("Starting researcher-publication matching...")
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    # ORM tables on the configured engine (SQLite or PostgreSQL)
+    db = get_session()
+    try:
+        return _match_researchers(db)
+    finally:
+        db.close()
 
+
+def _match_researchers(db):
     # 1. Get all Researchers
-    cursor.execute("SELECT id, nombre FROM Investigadores")
-    researchers = [dict(row) for row in cursor.fetchall()]
+    researchers = (
+        db.query(AcademicMember.id, AcademicMember.full_name)
+        .filter(AcademicMember.member_type == "researcher")
+        .all()
+    )
+    
+    # Prepare per-researcher matchers once instead of for every publication
+    # (lowercased name + compiled initials patterns; names too short to be unique are skipped)
+    matchers = []
+    for researcher_id, name in researchers:
+        if not name or len(name) < 5: continue
+        
+        initials_patterns = ()
+        parts = name.split()
+        if len(parts) >= 2:
+            last_name = re.escape(parts[-1])
+            first_initial = re.escape(parts[0][0])
+            initials_patterns = (
+                # Pattern 1: F. Lastname (e.g., P. Margozzini)
+                re.compile(rf"{first_initial}\.?\s+{last_name}", re.IGNORECASE),
+                # Pattern 2: Lastname, F. (e.g., Margozzini, P.)
+                re.compile(rf"{last_name},?\s+{first_initial}\.?", re.IGNORECASE),
+            )
+        matchers.append((researcher_id, name, name.lower(), initials_patterns))
+    
+    # Existing links, loaded once (replaces a SELECT per candidate match)
+    existing_links = set(db.query(ResearcherPublication.member_id, ResearcherPublication.publication_id).all())
     
     # 2. Get all Publications with text content
-    cursor.execute("SELECT id, titulo, contenido_texto FROM Publicaciones WHERE contenido_texto IS NOT NULL AND contenido_texto != ''")
-    publications = [dict(row) for row in cursor.fetchall()]
+    publications = (
+        db.query(Publication.id, Publication.title, Publication.content)
+        .filter(Publication.content.isnot(None), Publication.content != "")
+        .all()
+    )
     
     matches_found = 0
+    new_links = []
     
-    for pub in publications:
-        pub_id = pub['id']
+    for pub_id, title, content in publications:
         # Use first 3000 chars for matching (usually contains title and authors)
-        content_sample = pub['contenido_texto'][:3000]
-        title = pub['titulo']
+        content_sample = content[:3000]
         
         # Combine title and content for better matching context
         search_text = f"{title}\n{content_sample}"
+        search_text_lower = search_text.lower()
         
-        for researcher in researchers:
-            res_id = researcher['id']
-            name = researcher['nombre']
-            
-            # Skip if name is too short to be unique
-            if len(name) < 5: continue
-            
+        for res_id, name, name_lower, initials_patterns in matchers:
             match_score = 0
             match_method = None
             
             # Method A: Exact Match (Case Insensitive)
-            if name.lower() in search_text.lower():
+            if name_lower in search_text_lower:
                 match_score = 100
                 match_method = "exact"
             
             # Method B: Regex for "Lastname, Initial" or "Initial. Lastname"
-            # Split name into parts
-            parts = name.split()
-            if not match_method and len(parts) >= 2:
-                last_name = parts[-1]
-                first_initial = parts[0][0]
-                
-                # Pattern 1: F. Lastname (e.g., P. Margozzini)
-                p1 = rf"{first_initial}\.?\s+{last_name}"
-                # Pattern 2: Lastname, F. (e.g., Margozzini, P.)
-                p2 = rf"{last_name},?\s+{first_initial}\.?"
-                
-                if re.search(p1, search_text, re.IGNORECASE) or re.search(p2, search_text, re.IGNORECASE):
+            if not match_method and initials_patterns:
+                if any(p.search(search_text) for p in initials_patterns):
                     match_score = 90
                     match_method = "regex_initials"
 
@@ -67,28 +84,24 @@ def match_researchers():
             if not match_method:
                 # We check if the name is "partially" in the text with high similarity
                 # Partial ratio is good for finding substrings
-                score = fuzz.partial_ratio(name.lower(), search_text.lower())
+                score = fuzz.partial_ratio(name_lower, search_text_lower)
                 if score >= 85:
                     match_score = score
                     match_method = "fuzzy"
             
-            if match_score > 0:
-                # Check if match already exists to avoid duplicates
-                cursor.execute("""
-                    SELECT id FROM Investigador_Publicacion 
-                    WHERE investigador_id = ? AND publicacion_id = ?
-                """, (res_id, pub_id))
-                
-                if not cursor.fetchone():
-                    cursor.execute("""
-                        INSERT INTO Investigador_Publicacion (investigador_id, publicacion_id, match_score, match_method)
-                        VALUES (?, ?, ?, ?)
-                    """, (res_id, pub_id, match_score, match_method))
-                    matches_found += 1
-                    print(f"Match found: {name} -> {title[:30]}... ({match_method}: {match_score})")
+            if match_score > 0 and (res_id, pub_id) not in existing_links:
+                existing_links.add((res_id, pub_id))
+                new_links.append((res_id, pub_id, match_score, match_method))
+                matches_found += 1
+                print(f"Match found: {name} -> {title[:30]}... ({match_method}: {match_score})")
 
-    conn.commit()
-    conn.close()
+    # One multi-row INSERT for all new links
+    if new_links:
+        db.bulk_insert_mappings(ResearcherPublication, [
+            {"member_id": res_id, "publication_id": pub_id, "match_score": score, "match_method": method}
+            for res_id, pub_id, score, method in new_links
+        ])
+    db.commit()
     print(f"Matching complete. Found {matches_found} new links.")
     return matches_found
 
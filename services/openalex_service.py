@@ -4,6 +4,7 @@ OpenAlex API Integration Service
 - Fetches publication metrics (citations, journal info, collaborations) via DOI
 """
 
+import logging
 import requests
 import time
 from datetime import datetime, timedelta
@@ -14,6 +15,8 @@ from sqlalchemy.orm import Session
 from core.models import AcademicMember, ResearcherDetails
 from config import OPENALEX_CONTACT_EMAIL, OPENALEX_SYNC_THRESHOLD_DAYS
 
+logger = logging.getLogger(__name__)
+
 
 def fetch_metrics_by_orcid(orcid: str) -> Dict:
     """
@@ -193,10 +196,20 @@ def sync_all_researchers(db: Session, force_refresh: bool = False) -> Dict:
 # PUBLICATION METRICS (DOI)
 # ===========================
 
+import copy
 import re
+import threading
+from cachetools import TTLCache
 from tenacity import retry, stop_after_attempt, wait_exponential
 import urllib.parse
 
+# OpenAlex work JSON per lowercased DOI, so re-enriching a publication skips the round-trip
+_work_cache = TTLCache(maxsize=4096, ttl=6 * 3600)
+_work_cache_lock = threading.Lock()
+
+# DOIs per filter=doi:a|b|... request (OpenAlex caps OR filters at 50 values)
+DOI_BATCH_SIZE = 50
+
 
 def search_publication_by_title(title: str) -> Dict:
     """
@@ -292,6 +305,11 @@ def get_publication_by_doi(doi: str) -> Dict:
     # Clean DOI (remove URL prefix if present)
     clean_doi = extract_doi_from_url(doi)
     
+    with _work_cache_lock:
+        cached = _work_cache.get(clean_doi.lower())
+    if cached is not None:
+        return copy.deepcopy(cached)
+    
     url = f"https://api.openalex.org/works/doi:{clean_doi}"
     
     # Add email for polite pool (higher rate limits)
@@ -307,6 +325,8 @@ def get_publication_by_doi(doi: str) -> Dict:
             data = response.json()
             openalex_id = data.get("id", "").split("/")[-1]
             print(f"   [OpenAlex] ✅ Found publication: {openalex_id}")
+            with _work_cache_lock:
+                _work_cache[clean_doi.lower()] = copy.deepcopy(data)
             return data
         elif response.status_code == 404:
             print(f"   [OpenAlex] ⚠️ DOI not found: {clean_doi}")
@@ -340,6 +360,60 @@ def get_publication_by_doi(doi: str) -> Dict:
         )
 
 
+def get_publications_by_dois(dois: List[str]) -> Dict[str, Dict]:
+    """
+    Fetch OpenAlex works for many DOIs with one filter=doi:a|b|... request per batch.
+    
+    Cached works are served without a request and fetched ones are cached, so a
+    following get_publication_by_doi() for the same DOI is free. DOIs OpenAlex
+    doesn't know (or batches that fail) are simply missing from the result.
+    
+    Returns:
+        {lowercased clean DOI: OpenAlex publication data}
+    """
+    found = {}
+    pending = []
+    with _work_cache_lock:
+        for clean_doi in dict.fromkeys(extract_doi_from_url(d).lower() for d in dois if d):
+            cached = _work_cache.get(clean_doi)
+            if cached is None:
+                pending.append(clean_doi)
+            else:
+                found[clean_doi] = copy.deepcopy(cached)
+    
+    headers = {
+        "User-Agent": f"mailto:{OPENALEX_CONTACT_EMAIL}"
+    }
+    
+    for start in range(0, len(pending), DOI_BATCH_SIZE):
+        chunk = pending[start:start + DOI_BATCH_SIZE]
+        try:
+            response = requests.get(
+                "https://api.openalex.org/works",
+                params={
+                    "filter": "doi:" + "|".join(f"https://doi.org/{d}" for d in chunk),
+                    "per-page": DOI_BATCH_SIZE
+                },
+                headers=headers,
+                timeout=15
+            )
+            if response.status_code != 200:
+                logger.warning("[OpenAlex] Batch DOI lookup failed (HTTP %s) for %d DOIs", response.status_code, len(chunk))
+                continue
+            results = response.json().get("results", [])
+        except Exception as e:
+            logger.warning("[OpenAlex] Batch DOI lookup failed for %d DOIs", len(chunk), exc_info=True)
+            continue
+        
+        with _work_cache_lock:
+            for work in results:
+                work_doi = (work.get("doi") or "").lower().split("doi.org/")[-1]
+                if work_doi:
+                    _work_cache[work_doi] = copy.deepcopy(work)
+                    found[work_doi] = work
+    
+    return found
+
 
 def fetch_journal_metrics(source_id: str) -> Dict:
     """
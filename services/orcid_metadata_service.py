@@ -6,7 +6,7 @@ Queries ORCID API to extract author names, countries, and affiliations
 import requests
 import time
 import re
-from typing import Dict, List, Set, Optional
+from typing import Dict, List, Set, Optional, Union
 from datetime import datetime
 import PyPDF2
 
@@ -131,12 +131,12 @@ def get_orcid_metadata(orcid: str) -> Optional[Dict]:
         return None
 
 
-def extract_orcids_from_pdf_hyperlinks(pdf_bytes: bytes) -> List[str]:
+def extract_orcids_from_pdf_hyperlinks(pdf_bytes: Union[bytes, str]) -> List[str]:
     """
     Extract ORCIDs from PDF hyperlinks/annotations.
     
     Args:
-        pdf_bytes: PDF file content as bytes
+        pdf_bytes: PDF file content as bytes, or a path to the PDF
         
     Returns:
         List of ORCID identifiers found
@@ -146,7 +146,7 @@ def extract_orcids_from_pdf_hyperlinks(pdf_bytes: bytes) -> List[str]:
     
     try:
         import io
-        pdf = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+        pdf = PyPDF2.PdfReader(io.BytesIO(pdf_bytes) if isinstance(pdf_bytes, (bytes, bytearray)) else pdf_bytes)
         
         # Extract from annotations/hyperlinks
         for page in pdf.pages:
@@ -3,13 +3,20 @@ Publication Service
 Business logic for publication management and PDF processing
 """
 
+import copy
+import hashlib
 import io
+import logging
 import os
 import re
-from typing import Optional, List, Tuple, Dict
+import threading
+from typing import Optional, List, Tuple, Dict, Union
 import PyPDF2
 import pdfplumber
-from sqlalchemy.orm import Session
+from cachetools import LRUCache
+from sqlalchemy.orm import Session, joinedload
+
+from utils.pdf_text import extract_page_texts
 
 # Tenacity for API retry logic
 from tenacity import (
@@ -19,6 +26,9 @@ from tenacity import (
     before_sleep_log
 )
 
+logger = logging.getLogger(__name__)
+
+
 def _is_rate_limit_error(exception):
     """Check if exception is a rate limit error (429 or ResourceExhausted)."""
     error_message = str(exception).lower()
@@ -53,21 +63,34 @@ def call_gemini_generate_with_retry(model, prompt: str):
             raise
 
 
-def extract_text_from_pdf(file_bytes: bytes) -> str:
+def _pdf_source(file: Union[bytes, str]):
+    """Wrap in-memory PDF bytes for the PDF readers; paths are opened by the readers themselves."""
+    return io.BytesIO(file) if isinstance(file, (bytes, bytearray)) else file
+
+
+def extract_text_from_pdf(file_bytes: Union[bytes, str]) -> str:
     """
     Extract text content from a PDF file.
     
     Args:
-        file_bytes: PDF file as bytes
+        file_bytes: PDF file as bytes, or a path to it
         
     Returns:
         Extracted text as a string. Empty string if extraction fails.
     """
+    # PDFium first; the slower readers only run when it finds no text
+    try:
+        text_content = extract_page_texts(file_bytes)
+        if text_content:
+            return "\n\n".join(text_content)
+    except Exception:
+        logger.warning("pdfium extraction failed, falling back to pdfplumber", exc_info=True)
+    
     text_content = []
     
-    # Try with pdfplumber first (better for complex layouts)
+    # Then pdfplumber (better for complex layouts)
     try:
-        with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
+        with pdfplumber.open(_pdf_source(file_bytes)) as pdf:
             for page in pdf.pages:
                 page_text = page.extract_text()
                 if page_text:
@@ -80,7 +103,7 @@ def extract_text_from_pdf(file_bytes: bytes) -> str:
     
     # Fallback to PyPDF2
     try:
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_bytes))
+        pdf_reader = PyPDF2.PdfReader(_pdf_source(file_bytes))
         for page in pdf_reader.pages:
             page_text = page.extract_text()
             if page_text:
@@ -92,13 +115,13 @@ def extract_text_from_pdf(file_bytes: bytes) -> str:
         return ""
 
 
-def validate_pdf_file(filename: str, content: bytes) -> tuple[bool, Optional[str]]:
+def validate_pdf_file(filename: str, content: Union[bytes, str]) -> tuple[bool, Optional[str]]:
     """
     Validate that a file is a proper PDF.
     
     Args:
         filename: Name of the file
-        content: File content as bytes
+        content: File content as bytes, or a path to it (only the header is read)
         
     Returns:
         Tuple of (is_valid, error_message)
@@ -107,17 +130,35 @@ def validate_pdf_file(filename: str, content: bytes) -> tuple[bool, Optional[str
     if not filename.lower().endswith('.pdf'):
         return False, "El archivo debe ser un PDF (.pdf)"
     
+    if isinstance(content, (bytes, bytearray)):
+        header, size = content[:4], len(content)
+    else:
+        with open(content, 'rb') as f:
+            header = f.read(4)
+        size = os.path.getsize(content)
+    
     # Check PDF magic number
-    if not content.startswith(b'%PDF'):
+    if header != b'%PDF':
         return False, "El archivo no es un PDF válido"
     
     # Check minimum size (avoid empty files)
-    if len(content) < 100:
+    if size < 100:
         return False, "El archivo PDF está vacío o corrupto"
     
     return True, None
 
 
+# DOI patterns for extract_doi, compiled once (ordered by specificity)
+_DOI_TEXT_PATTERNS = (
+    # Pattern 1: Explicit "DOI:" prefix (most reliable)
+    re.compile(r'DOI\s*:?\s*(10\.\d{4,9}/[-._;()/:a-zA-Z0-9]+)', re.IGNORECASE),
+    
+    # Pattern 2: Standard DOI pattern with word boundary
+    # (also covers doi.org/ URLs, which the former URL-only pattern could never reach)
+    re.compile(r'\b(10\.\d{4,9}/[-._;()/:a-zA-Z0-9]+)', re.IGNORECASE),
+)
+
+
 def extract_doi(text: str) -> Optional[str]:
     """
     Extract DOI from PDF text using regex pattern.
@@ -128,33 +169,19 @@ def extract_doi(text: str) -> Optional[str]:
     Returns:
         DOI URL (with https://doi.org/ prefix) or None if not found
     """
-    # Normalize text: replace newlines and multiple spaces with single space
-    # This helps with PDFs where DOI might be split across lines
-    normalized_text = ' '.join(text.split())
-    
-    # Multiple DOI patterns to try (ordered by specificity)
-    patterns = [
-        # Pattern 1: Explicit "DOI:" prefix (most reliable)
-        r'DOI\s*:?\s*(10\.\d{4,9}/[-._;()/:a-zA-Z0-9]+)',
-        
-        # Pattern 2: Standard DOI pattern with word boundary
-        r'\b(10\.\d{4,9}/[-._;()/:a-zA-Z0-9]+)',
-        
-        # Pattern 3: DOI in URL format
-        r'(?:https?://)?(?:dx\.)?doi\.org/(10\.\d{4,9}/[-._;()/:a-zA-Z0-9]+)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, normalized_text, re.IGNORECASE)
+    # Patterns are tried in order of specificity; none of them can match across whitespace,
+    # so the raw text is searched directly (no normalized copy of a multi-MB string)
+    for pattern in _DOI_TEXT_PATTERNS:
+        match = pattern.search(text)
         if match:
             # Extract the DOI part (group 1)
             doi = match.group(1)
             # Clean up any trailing punctuation that might have been captured
             doi = doi.rstrip('.,;)]')
-            print(f"   [DOI Extraction] Found DOI: {doi}")
+            logger.debug("[DOI Extraction] Found DOI: %s", doi)
             return f"https://doi.org/{doi}"
     
-    print("   [DOI Extraction] No DOI found in text")
+    logger.debug("[DOI Extraction] No DOI found in text")
     return None
 
 
@@ -172,8 +199,11 @@ def match_authors_from_text(text: str, db: Session) -> List[int]:
     """
     from core.models import AcademicMember, ResearcherDetails
     
-    # Get all active researchers
-    researchers = db.query(AcademicMember).filter(
+    # Get all active researchers, with their details in the same query
+    # (ORCID and name variations are read for every researcher below)
+    researchers = db.query(AcademicMember).options(
+        joinedload(AcademicMember.researcher_details)
+    ).filter(
         AcademicMember.member_type == 'researcher',
         AcademicMember.is_active == True
     ).all()
@@ -194,13 +224,13 @@ def match_authors_from_text(text: str, db: Session) -> List[int]:
             clean_orcid = orcid.split('/')[-1].strip() if '/' in orcid else orcid.strip()
             if clean_orcid in found_orcids:
                 matched_ids.append(researcher.id)
-                print(f"   [Author Match] ✅ ORCID: {clean_orcid} → {researcher.full_name}")
+                logger.debug("[Author Match] ORCID: %s -> %s", clean_orcid, researcher.full_name)
                 continue
         
         # Priority 2: Check full name
         if researcher.full_name and researcher.full_name.lower() in text_lower:
             matched_ids.append(researcher.id)
-            print(f"   [Author Match] ✅ Name: {researcher.full_name}")
+            logger.debug("[Author Match] Name: %s", researcher.full_name)
             continue
         
         # Priority 3: Check researcher details variations
@@ -212,7 +242,7 @@ def match_authors_from_text(text: str, db: Session) -> List[int]:
                 full_name_variant = f"{details.first_name} {details.last_name}".lower()
                 if full_name_variant in text_lower:
                     matched_ids.append(researcher.id)
-                    print(f"   [Author Match] ✅ Name variant: {full_name_variant}")
+                    logger.debug("[Author Match] Name variant: %s", full_name_variant)
                     continue
             
             # Check name variations (pipe-separated)
@@ -221,16 +251,23 @@ def match_authors_from_text(text: str, db: Session) -> List[int]:
                 for variation in variations:
                     if variation.strip().lower() in text_lower:
                         matched_ids.append(researcher.id)
-                        print(f"   [Author Match] ✅ Variation: {variation.strip()}")
+                        logger.debug("[Author Match] Variation: %s", variation.strip())
                         break
     
     return list(set(matched_ids))  # Remove duplicates
 
 
+# Successful AI analyses keyed by a hash of (model, prompt text); re-running the same
+# publication text skips the Gemini call. Error results are never stored.
+_analysis_cache = LRUCache(maxsize=512)
+_analysis_cache_lock = threading.Lock()
+
+
 def analyze_text_with_ai(text: str, api_key: Optional[str] = None) -> Dict:
     """
     Analyze text with AI to generate summaries and extract journal metadata.
     Returns a dictionary with summaries and journal analysis.
+    Results for text already analyzed with the same model come from an in-process cache.
     """
     try:
         import google.generativeai as genai
@@ -248,15 +285,22 @@ def analyze_text_with_ai(text: str, api_key: Optional[str] = None) -> Dict:
                 "journal_analysis": None
             }
         
+        model_name = os.environ.get("GEMINI_MODEL_NAME", "gemini-2.0-flash-exp")
+        
+        # Prepare prompt (use first 15000 chars)
+        text_sample = text[:15000]
+        cache_key = hashlib.blake2b(f"{model_name}\0{text_sample}".encode(), digest_size=16).hexdigest()
+        with _analysis_cache_lock:
+            cached = _analysis_cache.get(cache_key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
         print(f"!!! [AI DEBUG] Starting analysis with model {os.environ.get('GEMINI_MODEL_NAME', 'default')}...")
         
         # Configure Gemini
         genai.configure(api_key=api_key)
-        model_name = os.environ.get("GEMINI_MODEL_NAME", "gemini-2.0-flash-exp")
         model = genai.GenerativeModel(model_name)
         
-        # Prepare prompt (use first 15000 chars)
-        text_sample = text[:15000]
         prompt = f"""Analiza este texto de una publicación científica.
 
 TAREAS:
@@ -309,7 +353,10 @@ TEXTO:
             result_text = result_text.split("```")[0].strip()
             
         try:
-            return json.loads(result_text)
+            analysis = json.loads(result_text)
+            with _analysis_cache_lock:
+                _analysis_cache[cache_key] = copy.deepcopy(analysis)
+            return analysis
         except json.JSONDecodeError:
             print(f"Error parsing AI JSON output: {result_text[:100]}...")
             return {
@@ -336,12 +383,12 @@ def _generate_placeholder_summaries() -> Tuple[str, str]:
     return resumen_es, resumen_en
 
 
-def enrich_publication_data(file_bytes: bytes, filename: str, db: Session, skip_ai: bool = False) -> dict:
+def enrich_publication_data(file_bytes: Union[bytes, str], filename: str, db: Session, skip_ai: bool = False) -> dict:
     """
     Orchestrator function that extracts and enriches all data from a PDF.
     
     Args:
-        file_bytes: PDF file as bytes
+        file_bytes: PDF file as bytes, or a path to it
         filename: Original filename
         db: Database session
         skip_ai: If True, skips LLM summary generation (Fast Path)
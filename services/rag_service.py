@@ -4,6 +4,7 @@ import os
 import sys
 import threading
 import json
+from collections import defaultdict
 from pathlib import Path
 
 # Database
@@ -303,104 +304,136 @@ class SemanticSearchEngine:
         Procesa y embebea una sola publicación recién subida.
         Retorna metadata de procesamiento para feedback al usuario.
         """
+        return self.process_publications_batch([pub_id])[pub_id]
+
+    # Chunk texts per embedding request (batch embedding accepts up to 100)
+    EMBED_BATCH_SIZE = 100
+
+    def process_publications_batch(self, pub_ids: List[int]) -> Dict[int, dict]:
+        """
+        Procesa y embebea varias publicaciones recién subidas de una vez: los chunks se
+        embeben en requests batch, se guardan en un solo commit y los embeddings en
+        memoria se recargan una vez por lote.
+        Retorna {pub_id: metadata de procesamiento} (mismo formato que process_single_publication).
+        """
         session = get_session()
+        results = {}
         
         try:
-            # 1. Fetch publication (join not needed but good for future)
-            # Use filter instead of execute
-            pub = session.query(Publication).filter(Publication.id == pub_id).first()
-            
-            if not pub:
-                return {"success": False, "error": "Publication not found"}
-            
-            title = pub.title
-            content = pub.content
-            
-            # 2. Validate content
-            if not content or len(content) < 100:
-                return {"success": False, "error": "Insufficient content (menos de 100 caracteres)", "chunks_created": 0}
-            
-            # 3. Check if already processed
-            existing_chunks = session.query(func.count(PublicationChunk.id)).filter(PublicationChunk.publication_id == pub_id).scalar()
-            if existing_chunks > 0:
-                print(f"   [RAG] Publication {pub_id} already indexed with {existing_chunks} chunks")
-                return {"success": True, "already_indexed": True, "chunks_created": existing_chunks}
-            
-            # 4. Generate chunks
-            chunk_size = 1000
-            overlap = 200
-            chunks = []
-            
-            for i in range(0, len(content), chunk_size - overlap):
-                chunk_text = content[i:i + chunk_size]
-                if len(chunk_text) < 100:
-                    continue
-                full_chunk = f"Publicación: {title}\nContenido: {chunk_text}"
-                chunks.append(full_chunk)
+            # 1. Fetch publications and their existing chunk counts
+            pubs = {
+                pub.id: pub for pub in
+                session.query(Publication.id, Publication.title, Publication.content)
+                .filter(Publication.id.in_(pub_ids))
+            }
+            existing_chunks = dict(
+                session.query(PublicationChunk.publication_id, func.count(PublicationChunk.id))
+                .filter(PublicationChunk.publication_id.in_(pub_ids))
+                .group_by(PublicationChunk.publication_id)
+                .all()
+            )
             
-            if not chunks:
-                return {"success": False, "error": "No valid chunks created", "chunks_created": 0}
+            # 2. Validate, skip already processed, and chunk the rest
+            titles = {}
+            pending = []  # (pub_id, chunk_index, chunk)
+            for pub_id in pub_ids:
+                pub = pubs.get(pub_id)
+                if not pub:
+                    results[pub_id] = {"success": False, "error": "Publication not found"}
+                    continue
+                
+                if not pub.content or len(pub.content) < 100:
+                    results[pub_id] = {"success": False, "error": "Insufficient content (menos de 100 caracteres)", "chunks_created": 0}
+                    continue
+                
+                if existing_chunks.get(pub_id):
+                    logger.info("[RAG] Publication %s already indexed with %d chunks", pub_id, existing_chunks[pub_id])
+                    results[pub_id] = {"success": True, "already_indexed": True, "chunks_created": existing_chunks[pub_id]}
+                    continue
+                
+                chunks = self._chunk_publication(pub.title, pub.content)
+                if not chunks:
+                    results[pub_id] = {"success": False, "error": "No valid chunks created", "chunks_created": 0}
+                    continue
+                
+                titles[pub_id] = pub.title
+                pending.extend((pub_id, idx, chunk) for idx, chunk in enumerate(chunks))
             
-            # 5. Generate embeddings
-            import json
-            saved_chunks = 0
-            failed_chunks = 0
+            # 3. Generate embeddings, EMBED_BATCH_SIZE chunks per request
+            saved_chunks = defaultdict(int)
+            failed_chunks = defaultdict(int)
             
-            for idx, chunk in enumerate(chunks):
+            for start in range(0, len(pending), self.EMBED_BATCH_SIZE):
+                batch = pending[start:start + self.EMBED_BATCH_SIZE]
                 try:
-                    emb = call_gemini_with_retry(
+                    embeddings = call_gemini_with_retry(
                         self.genai,
                         model="models/text-embedding-004",
-                        content=chunk,
+                        content=[chunk for _, _, chunk in batch],
                         task_type="retrieval_document"
                     )['embedding']
-                    
-                    new_chunk = PublicationChunk(
+                except Exception:
+                    logger.warning("[RAG] Failed to embed %d chunks", len(batch), exc_info=True)
+                    for pub_id, _, _ in batch:
+                        failed_chunks[pub_id] += 1
+                    continue
+                
+                for (pub_id, idx, chunk), emb in zip(batch, embeddings):
+                    session.add(PublicationChunk(
                         publication_id=pub_id,
                         chunk_index=idx,
                         content=chunk,
                         embedding=json.dumps(emb)
-                    )
-                    session.add(new_chunk)
-                    saved_chunks += 1
-                except Exception as e:
-                    print(f"   [Error] Failed to embed chunk {idx} of publication {pub_id}: {e}")
-                    failed_chunks += 1
-                    continue
+                    ))
+                    saved_chunks[pub_id] += 1
             
-            if saved_chunks > 0:
+            if saved_chunks:
                 session.commit()
                 
-                # 6. Reload embeddings in memory
-                print(f"   [RAG] Reloading embeddings to include new publication...")
-                # Important: Close session before calling another method that might use DB
-                # But here _load_publication_embeddings uses its own session, so it is safe inside or outside, 
-                # but better to finish transaction first.
-                
-                # Small optimization: Update in-memory lists directly instead of full reload?
-                # For now, full reload is safer for consistency.
+                # 4. Reload embeddings in memory, once for the whole batch
+                logger.info("[RAG] Reloading embeddings to include %d new publication(s)", len(saved_chunks))
                 self._load_publication_embeddings()
-                
-                print(f"   [Success] Publication '{title}' indexed: {saved_chunks} chunks saved, {failed_chunks} failed")
-                
-                return {
-                    "success": True,
-                    "chunks_created": saved_chunks,
-                    "chunks_failed": failed_chunks,
-                    "publication_title": title,
-                    "now_searchable": True,
-                    "already_indexed": False
-                }
-            else:
-                return {"success": False, "error": "Failed to save any chunks", "chunks_created": 0}
+            
+            for pub_id, title in titles.items():
+                if saved_chunks[pub_id]:
+                    logger.info("[RAG] Publication '%s' indexed: %d chunks saved, %d failed", title, saved_chunks[pub_id], failed_chunks[pub_id])
+                    results[pub_id] = {
+                        "success": True,
+                        "chunks_created": saved_chunks[pub_id],
+                        "chunks_failed": failed_chunks[pub_id],
+                        "publication_title": title,
+                        "now_searchable": True,
+                        "already_indexed": False
+                    }
+                else:
+                    results[pub_id] = {"success": False, "error": "Failed to save any chunks", "chunks_created": 0}
+            
+            return results
                 
         except Exception as e:
             session.rollback()
-            print(f"   [Error] Failed to process single publication {pub_id}: {e}")
-            return {"success": False, "error": str(e), "chunks_created": 0}
+            logger.exception("[RAG] Failed to process publications %s", pub_ids)
+            error = {"success": False, "error": str(e), "chunks_created": 0}
+            return {pub_id: results.get(pub_id, error) for pub_id in pub_ids}
         finally:
             session.close()
 
+    @staticmethod
+    def _chunk_publication(title: str, content: str) -> List[str]:
+        """Splits a publication into 1000-char chunks with 200 chars of overlap, prefixed with its title."""
+        chunk_size = 1000
+        overlap = 200
+        chunks = []
+        
+        for i in range(0, len(content), chunk_size - overlap):
+            chunk_text = content[i:i + chunk_size]
+            if len(chunk_text) < 100:
+                continue
+            full_chunk = f"Publicación: {title}\nContenido: {chunk_text}"
+            chunks.append(full_chunk)
+        
+        return chunks
+
     def process_and_embed_publications(self):
         """Chunks and embeds publications that don't have chunks yet."""
         print("   [System] Processing publications for RAG...")
@@ -0,0 +1,54 @@
+"""
+File utilities for CECAN Platform
+Streaming persistence of uploaded files
+"""
+
+import os
+
+from fastapi import HTTPException, UploadFile, status
+from starlette.concurrency import run_in_threadpool
+
+from config import MAX_UPLOAD_SIZE_MB
+
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+MAX_UPLOAD_BYTES = MAX_UPLOAD_SIZE_MB * 1024 * 1024
+
+
+async def save_upload_file(file: UploadFile, destination, hasher=None) -> int:
+    """
+    Stream an uploaded file to disk in 1 MiB chunks without blocking the event loop.
+    
+    Args:
+        file: Incoming UploadFile
+        destination: Target file path
+        hasher: Optional hashlib object, updated with every chunk written
+    
+    Raises:
+        HTTPException 413: If the upload exceeds MAX_UPLOAD_SIZE_MB (partial file is removed)
+    
+    Returns:
+        Number of bytes written
+    """
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File exceeds {MAX_UPLOAD_SIZE_MB} MB limit"
+    )
+    if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+        raise too_large
+
+    written = 0
+    buffer = await run_in_threadpool(open, destination, "wb")
+    try:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            written += len(chunk)
+            if written > MAX_UPLOAD_BYTES:
+                raise too_large
+            if hasher is not None:
+                hasher.update(chunk)
+            await run_in_threadpool(buffer.write, chunk)
+    except BaseException:
+        buffer.close()
+        os.remove(destination)
+        raise
+    buffer.close()
+    return written
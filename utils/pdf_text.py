@@ -0,0 +1,96 @@
+"""
+PDF text utilities for CECAN Platform
+PDFium page text extraction; long documents are split across worker processes
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Union
+
+import pypdfium2
+
+logger = logging.getLogger(__name__)
+
+# Documents with more pages than this (given as a path) are extracted in PAGE_RANGE_SIZE-page
+# ranges by a process pool; shorter ones aren't worth the inter-process round-trip
+PARALLEL_MIN_PAGES = 32
+PAGE_RANGE_SIZE = 16
+
+# PDFium is not thread-safe and uploads are ingested from the threadpool
+_pdfium_lock = threading.Lock()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _page_texts(pdf, start: int, end: int) -> List[str]:
+    """Non-blank page texts of pages [start, end), with PDFium's CRLF line breaks normalized."""
+    pages = []
+    for index in range(start, end):
+        page = pdf[index]
+        textpage = page.get_textpage()
+        page_text = textpage.get_text_range().replace("\r\n", "\n")
+        textpage.close()
+        page.close()
+        if page_text.strip():
+            pages.append(page_text)
+    return pages
+
+
+def _extract_range(path: str, start: int, end: int) -> List[str]:
+    """Worker process: open the document and extract one page range."""
+    pdf = pypdfium2.PdfDocument(path)
+    try:
+        return _page_texts(pdf, start, end)
+    finally:
+        pdf.close()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a process that runs threads (threadpool, log listener) can deadlock the child
+            _pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def extract_page_texts(file: Union[bytes, str]) -> List[str]:
+    """
+    Extract the text of every non-blank page of a PDF with PDFium.
+
+    Args:
+        file: PDF as bytes, or a path to it
+
+    Returns:
+        Page texts in page order
+    """
+    with _pdfium_lock:
+        pdf = pypdfium2.PdfDocument(file)
+        try:
+            page_count = len(pdf)
+            if page_count <= PARALLEL_MIN_PAGES or isinstance(file, (bytes, bytearray)):
+                return _page_texts(pdf, 0, page_count)
+        finally:
+            pdf.close()
+
+    # Long document on disk: each worker reopens it and extracts one page range
+    ranges = [(start, min(start + PAGE_RANGE_SIZE, page_count)) for start in range(0, page_count, PAGE_RANGE_SIZE)]
+    try:
+        pool = _get_pool()
+        futures = [pool.submit(_extract_range, str(file), start, end) for start, end in ranges]
+        return [text for future in futures for text in future.result()]
+    except Exception as e:
+        logger.warning("Parallel PDF extraction failed, extracting in-process: %s", e)
+        with _pdfium_lock:
+            pdf = pypdfium2.PdfDocument(file)
+            try:
+                return _page_texts(pdf, 0, page_count)
+            finally:
+                pdf.close()